@@ -1,6 +1,6 @@
 from fastapi import APIRouter, HTTPException
 from app.models import *
-from app.services import IntermediateService
+from app.services import intermediate_service
 
 router = APIRouter(prefix="/api/intermediate", tags=["intermediate"])
 
@@ -10,8 +10,7 @@ async def get_intermediate_result(session_id: str):
     중간 결과 조회 - GPT 기반 성격 분석
     """
     try:
-        service = IntermediateService()
-        result = service.get_intermediate_result(session_id)
+        result = await intermediate_service.get_intermediate_result(session_id)
         
         if not result["success"]:
             raise HTTPException(status_code=404, detail=result["error"])
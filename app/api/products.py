@@ -1,13 +1,29 @@
 """
 상품 관련 API
 """
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Query, Response
+from utils.config import PRODUCT_CONFIG
 from ..models import ProductResponse
 from ..services import product_service
 
 router = APIRouter()
 
+@router.get("/api/products", response_model=ProductResponse)
+async def get_products(ids: str = Query(..., description="쉼표로 구분한 상품 ID 목록")):
+    """여러 상품 정보 일괄 조회 (ID 수가 제한을 넘으면 422)"""
+    product_ids = [product_id.strip() for product_id in ids.split(",") if product_id.strip()]
+    if len(product_ids) > PRODUCT_CONFIG["batch_max_ids"]:
+        raise HTTPException(
+            status_code=422,
+            detail=f"상품 ID는 한 번에 최대 {PRODUCT_CONFIG['batch_max_ids']}개까지 조회할 수 있습니다."
+        )
+    return product_service.get_products(product_ids)
+
 @router.get("/api/products/{product_id}", response_model=ProductResponse)
 async def get_product_detail(product_id: str):
     """상품 상세 정보 조회"""
-    return product_service.get_product(product_id)
\ No newline at end of file
+    payload = product_service.get_product_payload(product_id)
+    if payload is None:
+        # 잘못된 ID / 없는 상품은 기존 오류 응답 사용
+        return product_service.get_product(product_id)
+    return Response(content=payload, media_type="application/json")
\ No newline at end of file
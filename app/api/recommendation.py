@@ -1,13 +1,23 @@
 """
 추천 관련 API
 """
-from fastapi import APIRouter
-from ..models import RecommendationResponse
+from typing import Optional
+from fastapi import APIRouter, Query
+from fastapi.concurrency import run_in_threadpool
+from ..models import RecommendationResponse, BatchRecommendationRequest
 from ..services import recommendation_service
 
 router = APIRouter()
 
 @router.get("/api/recommendation/{session_id}", response_model=RecommendationResponse)
-async def get_recommendations(session_id: str):
+async def get_recommendations(
+    session_id: str,
+    expand: Optional[str] = Query(None, pattern="^product$", description="product: 상품 요약 정보 포함")
+):
     """그래프 기반 추천 상품 조회"""
-    return recommendation_service.get_recommendations(session_id)
\ No newline at end of file
+    return await recommendation_service.get_recommendations(session_id, expand=expand)
+
+@router.post("/api/recommendation/batch", response_model=RecommendationResponse)
+async def get_batch_recommendations(data: BatchRecommendationRequest):
+    """여러 세션의 추천 상품 일괄 조회 (행렬 연산은 스레드풀에서 실행)"""
+    return await run_in_threadpool(recommendation_service.get_batch_recommendations, data.session_ids, data.top_k)
\ No newline at end of file
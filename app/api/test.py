@@ -1,18 +1,35 @@
 """
 심리테스트 관련 API
 """
-from fastapi import APIRouter
+from typing import Optional
+from fastapi import APIRouter, Header, Response
+from fastapi.concurrency import run_in_threadpool
+from utils.config import API_CACHE_CONFIG
 from ..models import TestQuestionsResponse, TestSubmitRequest, TestSubmitResponse
 from ..services import test_service
 
 router = APIRouter()
 
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더가 현재 ETag와 일치하는지 확인 (약한 비교)"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any((tag[2:] if tag.startswith("W/") else tag) == etag for tag in candidates)
+
 @router.get("/api/test/questions", response_model=TestQuestionsResponse)
-async def get_test_questions():
-    """심리테스트 문항 조회"""
-    return test_service.get_questions()
+async def get_test_questions(if_none_match: Optional[str] = Header(None)):
+    """심리테스트 문항 조회 (미리 직렬화된 응답 + ETag)"""
+    payload, etag = test_service.get_questions_payload()
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={API_CACHE_CONFIG['questions_max_age']}"
+    }
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=payload, media_type="application/json", headers=headers)
 
 @router.post("/api/test/submit", response_model=TestSubmitResponse)
 async def submit_test_answers(data: TestSubmitRequest):
-    """심리테스트 답변 제출"""
-    return test_service.submit(data)
\ No newline at end of file
+    """심리테스트 답변 제출 (점수 계산은 스레드풀에서 실행)"""
+    return await run_in_threadpool(test_service.submit, data)
\ No newline at end of file
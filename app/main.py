@@ -1,20 +1,103 @@
 """
 SantaPick Backend - FastAPI 메인 애플리케이션
 """
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 
 # API 라우터들 import
 from .api import user, test, recommendation, products, intermediate
+from .services import recommendation_service, session_store, warm_up_services
+from utils.config import SESSION_CONFIG
+from utils.gpt_service import gpt_cache
+from utils.logger import get_logger, setup_logging
+from utils.metrics import registry, HTTP_REQUEST_SECONDS, HTTP_REQUESTS
+
+setup_logging()
+logger = get_logger(__name__)
+
+# 모델/데이터 사전 로드 상태
+warmup_state = {
+    "ready": False,
+    "error": None,
+    "stages": {},
+    "total_seconds": None
+}
+
+async def run_warmup():
+    """엔진, 상품, 질문, 노드 매핑을 스레드풀에서 미리 로드"""
+    started = time.perf_counter()
+    try:
+        await run_in_threadpool(warm_up_services, warmup_state["stages"])
+        warmup_state["ready"] = True
+    except Exception as e:
+        warmup_state["error"] = str(e)
+        logger.exception("워밍업 실패")
+    finally:
+        warmup_state["total_seconds"] = time.perf_counter() - started
+
+async def sweep_sessions():
+    """만료된 세션을 주기적으로 정리 (User 임베딩도 함께 해제)"""
+    while True:
+        await asyncio.sleep(SESSION_CONFIG["sweep_interval_seconds"])
+        try:
+            expired = await run_in_threadpool(session_store.purge_expired)
+            if expired:
+                logger.info("만료 세션 정리: %d개", len(expired))
+        except Exception:
+            logger.exception("세션 정리 실패")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 서버는 바로 요청을 받되, 워밍업 완료 전까지 /ready는 503 반환
+    warmup_task = asyncio.create_task(run_warmup())
+    sweeper_task = asyncio.create_task(sweep_sessions())
+    yield
+    warmup_task.cancel()
+    sweeper_task.cancel()
+
+class MetricsMiddleware:
+    """엔드포인트별 응답 시간과 상태 코드 집계 (순수 ASGI 미들웨어)"""
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = [500]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            endpoint = scope.get("endpoint")
+            name = getattr(endpoint, "__name__", "unmatched")
+            HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, endpoint=name)
+            HTTP_REQUESTS.inc(endpoint=name, status=str(status[0]))
 
 # FastAPI 앱 생성
 app = FastAPI(
     title="SantaPick API",
     description="심리테스트 기반 선물 추천 시스템",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+app.add_middleware(MetricsMiddleware)
+
 # CORS 설정 (프론트엔드 연동용)
 app.add_middleware(
     CORSMiddleware,
@@ -34,7 +117,10 @@ app.include_router(intermediate.router, tags=["중간결과"])
 # 정적 파일 서빙 (상품 이미지)
 from pathlib import Path
 static_dir = Path(__file__).parent.parent / "statics"
-app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
+if static_dir.exists():
+    app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
+else:
+    logger.warning("정적 파일 디렉토리가 없어 /static을 마운트하지 않습니다: %s", static_dir)
 
 # 기본 엔드포인트
 @app.get("/")
@@ -45,6 +131,61 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
-if __name__ == "__main__":
+@app.get("/ready")
+async def readiness_check():
+    content = {
+        "status": "ready" if warmup_state["ready"] else "warming_up",
+        "error": warmup_state["error"],
+        "stages": warmup_state["stages"],
+        "total_seconds": warmup_state["total_seconds"]
+    }
+    return JSONResponse(status_code=200 if warmup_state["ready"] else 503, content=content)
+
+# 저장소 통계는 SQLite 조회가 있을 수 있으므로 동기 함수로 두어 스레드풀에서 실행
+@app.get("/stats")
+def memory_stats():
+    return {
+        "sessions": session_store.stats(),
+        "user_embeddings": recommendation_service.get_memory_stats(),
+        "gpt_cache": gpt_cache.stats() if gpt_cache is not None else None
+    }
+
+def main():
+    """서버 실행 (--workers 2 이상이면 모델을 한 번 로드한 뒤 워커를 fork)"""
+    import argparse
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    from .server import serve
+
+    parser = argparse.ArgumentParser(description="SantaPick API 서버")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", "1")))
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args()
+
+    if args.workers > 1:
+        serve(app, host=args.host, port=args.port, workers=args.workers, log_level=args.log_level)
+    else:
+        uvicorn.run(app, host=args.host, port=args.port, log_level=args.log_level)
+
+# 캐시 적중률 및 저장소 크기 (조회 시점 값)
+registry.gauge(
+    "santapick_gpt_cache_hit_ratio", "GPT 응답 캐시 적중률",
+    lambda: gpt_cache.stats()["hit_rate"] if gpt_cache is not None else None
+)
+registry.gauge(
+    "santapick_user_embedding_hit_ratio", "User 임베딩 저장소 적중률",
+    lambda: recommendation_service.get_memory_stats()["hit_rate"]
+)
+registry.gauge(
+    "santapick_user_embeddings", "User 임베딩 저장소 항목 수",
+    lambda: recommendation_service.get_memory_stats()["entries"]
+)
+registry.gauge("santapick_sessions", "세션 저장소 항목 수", lambda: len(session_store))
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,8 +1,9 @@
 """
 Pydantic 모델 정의
 """
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Dict, Any, Optional
+from utils.config import RECOMMENDATION_CONFIG
 
 # 사용자 정보 관련
 class UserInfoRequest(BaseModel):
@@ -45,6 +46,11 @@ class RecommendationItem(BaseModel):
     score: float
     rank: int
 
+class BatchRecommendationRequest(BaseModel):
+    # 요청 1회가 스레드풀을 오래 점유하지 않도록 세션 수와 추천 개수 제한 (범위 밖이면 422)
+    session_ids: List[str] = Field(..., min_length=1, max_length=RECOMMENDATION_CONFIG["batch_max_sessions"])
+    top_k: int = Field(RECOMMENDATION_CONFIG["top_k"], ge=1, le=RECOMMENDATION_CONFIG["batch_max_top_k"])
+
 class RecommendationResponse(BaseModel):
     success: bool
     data: Optional[Dict[str, Any]] = None
@@ -0,0 +1,102 @@
+"""
+멀티 워커 실행 - 부모 프로세스에서 모델/데이터를 한 번 로드한 뒤 워커를 fork
+
+워커들은 부모가 로드한 읽기 전용 NumPy 배열(아이템 행렬, 노드 임베딩)과 상품/질문 데이터를
+copy-on-write로 공유하므로 워커 수만큼 메모리가 늘어나지 않는다. 리스닝 소켓도 부모가 열어 공유한다.
+"""
+import gc
+import os
+import signal
+import socket
+import time
+import uvicorn
+from .services import warm_up_services
+from utils.config import SESSION_CONFIG
+from utils.logger import get_logger, stop_logging
+
+logger = get_logger(__name__)
+
+def _bind_socket(host, port, backlog=2048):
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+def _spawn_worker(app, sock, log_level):
+    """워커 프로세스 fork 후 공유 소켓으로 uvicorn 실행"""
+    pid = os.fork()
+    if pid != 0:
+        return pid
+
+    # 자식: 부모의 종료 핸들러 대신 uvicorn 기본 시그널 처리 사용
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    exit_code = 0
+    try:
+        server = uvicorn.Server(uvicorn.Config(app, log_level=log_level))
+        server.run(sockets=[sock])
+    except BaseException:
+        exit_code = 1
+    finally:
+        # os._exit는 atexit를 실행하지 않으므로 큐에 남은 로그를 직접 출력
+        stop_logging()
+        os._exit(exit_code)
+
+def serve(app, host="0.0.0.0", port=8000, workers=2, log_level="info"):
+    """모델/데이터 사전 로드 → GC freeze → 워커 fork (비정상 종료된 워커는 재시작)"""
+    # memory 세션은 워커마다 따로 생기므로 다른 워커로 간 요청이 SESSION_NOT_FOUND가 됨
+    if workers > 1 and SESSION_CONFIG["backend"] == "memory":
+        logger.error(
+            "워커 %d개에서는 memory 세션 저장소를 공유할 수 없습니다. "
+            "SESSION_BACKEND=sqlite로 실행하거나 --workers 1을 사용하세요.", workers
+        )
+        raise SystemExit(2)
+
+    if not hasattr(os, "fork"):
+        logger.warning("fork를 지원하지 않는 환경입니다. 단일 프로세스로 실행합니다.")
+        uvicorn.run(app, host=host, port=port, log_level=log_level)
+        return
+
+    started = time.perf_counter()
+    timings = warm_up_services()
+    logger.info("워커 fork 전 사전 로드 완료: %.2f초 %s", time.perf_counter() - started, timings)
+
+    # 로드된 객체를 GC 대상에서 제외해 워커에서 GC가 공유 페이지를 건드리지 않도록 함
+    gc.collect()
+    gc.freeze()
+
+    sock = _bind_socket(host, port)
+    children = set()
+    stopping = False
+
+    def _stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+
+    for _ in range(workers):
+        children.add(_spawn_worker(app, sock, log_level))
+    logger.info("워커 %d개 시작: %s (http://%s:%d)", workers, sorted(children), host, port)
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        children.discard(pid)
+        if not stopping:
+            logger.warning("워커 %d 비정상 종료 (status=%d), 재시작", pid, status)
+            time.sleep(1.0)
+            children.add(_spawn_worker(app, sock, log_level))
+
+    sock.close()
@@ -1,23 +1,54 @@
 """
 비즈니스 로직 및 세션 관리
 """
+import hashlib
+import json
+import logging
+import threading
+import time
 import uuid
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from fastapi.concurrency import run_in_threadpool
 from .models import UserInfoRequest
-from utils.gpt_service import GPTService
+from utils.gpt_service import AsyncGPTService
+from .session_store import create_session_store
+from utils.config import RECOMMENDATION_CONFIG, SESSION_CONFIG
+from utils.engines.data_loader import PsychologyDataLoader
+from utils.engines.diversity import mmr_rerank
+from utils.engines.product_catalog import ProductCatalog
+from utils.engines.scoring_calculator import ScoringCalculator
+from utils.engines.user_store import UserEmbeddingStore
+from utils.logger import get_logger
+from utils.metrics import RECOMMENDATION_CACHE, stage_timer
 
-# 메모리 기반 세션 저장소
-sessions: Dict[str, Dict[str, Any]] = {}
+logger = get_logger(__name__)
+
+# 추천/중간 결과 서비스가 함께 쓰는 GPT 클라이언트 (동시 호출 수 제한 max_concurrency를 프로세스 전체에 적용)
+gpt_service = AsyncGPTService()
+
+# 세션 저장소 (만료/제거된 세션의 User 임베딩은 추천 서비스에서 해제)
+session_store = create_session_store(
+    SESSION_CONFIG,
+    on_evict=lambda session_id: recommendation_service.release_user_embedding(session_id)
+)
+
+# 같은 세션의 읽기-수정-저장을 스레드 간 직렬화 (세션 ID 해시로 고른 lock, 프로세스 내에서만 유효)
+_SESSION_LOCKS = tuple(threading.Lock() for _ in range(64))
+
+def session_lock(session_id: str):
+    return _SESSION_LOCKS[hash(session_id) % len(_SESSION_LOCKS)]
 
 class UserService:
     def save_info(self, user_data: UserInfoRequest) -> Dict[str, Any]:
         session_id = str(uuid.uuid4())
-        sessions[session_id] = {
+        session_store.save(session_id, {
             'user_info': user_data.dict(),
             'answers': [],
             'personality_scores': {},
-            'created_at': None
-        }
+            'score_state': ScoringCalculator.new_score_state(),
+            'answers_version': 0,
+            'created_at': time.time()
+        })
         return {
             "success": True,
             "data": {
@@ -27,60 +58,103 @@ class UserService:
         }
 
 class TestService:
-    def get_questions(self) -> Dict[str, Any]:
-        # 데이터 로더에서 질문 가져오기
-        import sys
-        from pathlib import Path
-        sys.path.append(str(Path(__file__).parent.parent))
-        from utils.engines.data_loader import PsychologyDataLoader
+    def __init__(self):
+        self.calculator = None
+        # (CSV 수정 시각, 질문 구조, 직렬화된 응답 바이트, ETag)
+        self.questions_cache = None
+        self._lock = threading.Lock()
+    
+    def _get_calculator(self):
+        """점수 계산기 lazy loading (CSV는 한 번만 읽고 모든 요청에서 공유)"""
+        if self.calculator is None:
+            with self._lock:
+                if self.calculator is None:
+                    self.calculator = ScoringCalculator()
+        return self.calculator
+    
+    def _load_questions(self):
+        """질문 캐시 lazy loading (CSV가 그대로면 lock 없이 반환, 바뀌었을 때만 lock 잡고 재생성)"""
         loader = PsychologyDataLoader()
-        structured_questions = loader.create_question_structure()
-        
-        return {
-            "success": True,
-            "data": {
-                "total_questions": len(structured_questions),
-                "questions": structured_questions
-            }
-        }
+        source_mtimes = loader.source_mtimes()
+        cache = self.questions_cache
+        if cache is None or cache[0] != source_mtimes:
+            with self._lock:
+                cache = self._refresh_questions(loader, source_mtimes)
+        return cache
+    
+    def _refresh_questions(self, loader, source_mtimes):
+        """CSV 수정 시각이 바뀌었으면 질문 구조와 직렬화된 응답을 다시 생성 (lock 안에서 호출)"""
+        cache = self.questions_cache
+        if cache is None or cache[0] != source_mtimes:
+            structured_questions = loader.create_question_structure()
+            # 응답 JSON을 한 번만 직렬화하고 내용 해시를 강한 ETag로 사용
+            payload = json.dumps(
+                {
+                    "success": True,
+                    "data": {
+                        "total_questions": len(structured_questions),
+                        "questions": structured_questions
+                    },
+                    "error": None
+                },
+                ensure_ascii=False,
+                separators=(',', ':')
+            ).encode('utf-8')
+            etag = f'"{hashlib.sha256(payload).hexdigest()[:32]}"'
+            cache = (source_mtimes, structured_questions, payload, etag)
+            self.questions_cache = cache
+        return cache
+    
+    def get_questions_payload(self):
+        """미리 직렬화된 질문 응답 바이트와 ETag 반환"""
+        _, _, payload, etag = self._load_questions()
+        return payload, etag
     
     def submit(self, data) -> Dict[str, Any]:
-        if data.session_id not in sessions:
+        """답변 제출 (스레드풀에서 호출되므로 같은 세션의 동시 제출은 순서대로 처리)"""
+        with session_lock(data.session_id):
+            return self._submit(data)
+    
+    def _submit(self, data) -> Dict[str, Any]:
+        with stage_timer("submit", "session_load"):
+            session = session_store.get(data.session_id)
+        if session is None:
             return {
                 "success": False,
                 "data": None,
                 "error": {"code": "SESSION_NOT_FOUND", "message": "세션을 찾을 수 없습니다."}
             }
         
-        session = sessions[data.session_id]
-        session['answers'].extend(data.answers)
-        
-        # 점수 계산
+        # 점수 계산 (새 답변만 누적 합계/개수에 반영)
         try:
-            import sys
-            from pathlib import Path
-            sys.path.append(str(Path(__file__).parent.parent))
-            from utils.engines.scoring_calculator import ScoringCalculator
-            
-            calculator = ScoringCalculator()
-            # 답변 형식을 scoring_calculator에 맞게 변환
-            formatted_answers = {}
-            for i, answer in enumerate(session['answers']):
-                formatted_answers[str(i)] = answer
-            
-            user_weights = calculator.calculate_user_weights(formatted_answers)
-            session['personality_scores'] = user_weights
+            with stage_timer("submit", "scoring"):
+                calculator = self._get_calculator()
+                previous_state = session.get('score_state') or calculator.new_score_state()
+                score_state = calculator.accumulate(
+                    {'sums': dict(previous_state['sums']), 'counts': dict(previous_state['counts'])},
+                    data.answers
+                )
+                user_weights = calculator.finalize_weights(score_state)
             
         except Exception as e:
-            # 점수 계산 실패 시 오류 반환
-            print(f"점수 계산 실패: {e}")
-            print(f"답변 데이터 형식: {session.get('answers', [])[:2]}")  # 처음 2개 답변 확인
+            # 점수 계산 실패 시 오류 반환 (세션 상태는 변경하지 않음)
+            logger.warning("점수 계산 실패 (답변 %d개): %s", len(data.answers), e)
             return {
                 "success": False,
                 "data": None,
                 "error": {"code": "SCORING_ERROR", "message": f"점수 계산 실패: {str(e)}"}
             }
         
+        session['answers'].extend(data.answers)
+        session['score_state'] = score_state
+        session['personality_scores'] = user_weights
+        # 답변이 추가되면 이전 GPT 최종 분석과 추천 결과는 무효
+        session['answers_version'] = session.get('answers_version', 0) + 1
+        session.pop('final_analysis', None)
+        session.pop('recommendation_cache', None)
+        with stage_timer("submit", "session_save"):
+            session_store.save(data.session_id, session)
+        
         if data.progress.is_final:
             return {
                 "success": True,
@@ -101,69 +175,57 @@ class TestService:
             }
 
 class RecommendationService:
-    def __init__(self):
+    def __init__(self, gpt_service):
         self.engine = None
-        self.gpt_service = GPTService()
-        self.entity_mapping = None
-        
-    def _load_entity_mapping(self):
-        """entity_list.txt에서 그래프 노드 ID → 실제 상품 ID 매핑 로드"""
-        if self.entity_mapping is None:
-            import pandas as pd
-            from pathlib import Path
-            
-            # entity_list.txt 파일 경로
-            entity_path = Path(__file__).parent.parent / "data" / "graph_data" / "entity_list.txt"
-            
-            if not entity_path.exists():
-                # 원본 경로에서 복사
-                original_path = Path(__file__).parent.parent.parent / "Present-Recommedation" / "data" / "graph_data" / "entity_list.txt"
-                if original_path.exists():
-                    entity_path.parent.mkdir(parents=True, exist_ok=True)
-                    import shutil
-                    shutil.copy(original_path, entity_path)
-            
-            self.entity_mapping = {}
-            if entity_path.exists():
-                with open(entity_path, 'r') as f:
-                    for line in f:
-                        parts = line.strip().split()
-                        if len(parts) >= 3 and parts[2] == 'item':
-                            real_product_id = int(parts[0])  # 실제 상품 ID
-                            graph_node_id = int(parts[1])   # 그래프 노드 ID
-                            self.entity_mapping[graph_node_id] = real_product_id
-        
-        return self.entity_mapping
+        self.gpt_service = gpt_service
+        # 세션 ID를 키로 User 임베딩 보관 (세션 수명과 동일하게 TTL/LRU 제한)
+        self.user_store = UserEmbeddingStore(
+            max_entries=RECOMMENDATION_CONFIG["user_embedding_max_entries"],
+            ttl_seconds=RECOMMENDATION_CONFIG["user_embedding_ttl_seconds"]
+        )
+        self._engine_lock = threading.Lock()
         
     def _get_engine(self):
-        """추천 엔진 lazy loading"""
+        """추천 엔진 lazy loading (동시 요청에서도 한 번만 로드, 로드가 끝난 엔진만 공개)"""
         if self.engine is None:
-            import sys
-            from pathlib import Path
-            sys.path.append(str(Path(__file__).parent.parent))
-            from utils.engines.recommendation_engine import RecommendationEngine
-            self.engine = RecommendationEngine()
-            self.engine.load_model()
+            with self._engine_lock:
+                if self.engine is None:
+                    import sys
+                    from pathlib import Path
+                    sys.path.append(str(Path(__file__).parent.parent))
+                    from utils.engines.recommendation_engine import RecommendationEngine
+                    engine = RecommendationEngine(user_store=self.user_store)
+                    engine.load_model()
+                    self.engine = engine
         return self.engine
     
+    def release_user_embedding(self, session_id: str) -> bool:
+        """세션 종료 시 해당 세션의 User 임베딩 제거"""
+        return self.user_store.remove(session_id)
+    
+    def get_memory_stats(self) -> Dict[str, Any]:
+        """User 임베딩 저장소 메모리 통계"""
+        return self.user_store.stats()
+    
     def _extract_product_id(self, item_id):
         """그래프 노드 ID에서 실제 product_id 추출"""
         try:
             graph_node_id = int(item_id)
-            entity_mapping = self._load_entity_mapping()
-            return entity_mapping.get(graph_node_id, None)
+            return self._get_engine().node_index.product_id(graph_node_id)
         except (ValueError, TypeError):
             return None
     
-    def get_recommendations(self, session_id: str) -> Dict[str, Any]:
-        if session_id not in sessions:
+    async def get_recommendations(self, session_id: str, expand: Optional[str] = None) -> Dict[str, Any]:
+        # SQLite 저장소의 get은 만료 시각 갱신(UPDATE + commit)과 lock 대기가 있으므로 스레드풀에서 조회
+        with stage_timer("recommendation", "session_load"):
+            session = await run_in_threadpool(session_store.get, session_id)
+        if session is None:
             return {
                 "success": False,
                 "data": None,
                 "error": {"code": "SESSION_NOT_FOUND", "message": "세션을 찾을 수 없습니다."}
             }
         
-        session = sessions[session_id]
         user_weights = session.get('personality_scores', {})
         
         # personality_scores가 없으면 추천 불가
@@ -174,101 +236,206 @@ class RecommendationService:
                 "error": {"code": "NO_PERSONALITY_DATA", "message": "성격 분석 결과가 없습니다. 먼저 심리테스트를 완료해주세요."}
             }
         
-        # GPT 분석 결과를 기반으로 가중치 최종 조정 (선택사항)
+        # 같은 답변 버전의 추천 결과가 있으면 재사용 (새로고침/링크 공유)
+        answers_version = session.get('answers_version', 0)
+        cached = session.get('recommendation_cache')
+        if cached is not None and cached['answers_version'] == answers_version:
+            RECOMMENDATION_CACHE.inc(outcome="hit")
+            return {"success": True, "data": self._expand_result(cached['data'], expand)}
+        RECOMMENDATION_CACHE.inc(outcome="miss")
+        
+        # GPT 최종 분석 (세션당 1회, 가중치 조정과 응답에 함께 사용)
+        with stage_timer("recommendation", "gpt_analysis"):
+            gpt_result, cacheable = await self._get_final_analysis(session_id, session, user_weights)
+        
+        # GPT 분석 결과를 기반으로 가중치 최종 조정 (세션의 성격 점수는 변경하지 않음)
         try:
-            all_answers = session.get('answers', [])
-            gpt_result = self.gpt_service.generate_final_result(
-                user_weights,
-                session['user_info']['name'], 
-                all_answers
-            )
-            
-            # GPT 분석 결과를 바탕으로 가중치 조정
-            adjusted_weights = self._adjust_weights_with_gpt_analysis(
-                user_weights, 
-                gpt_result.get('personality_type', ''),
-                gpt_result.get('description', '')
-            )
-            
-            session['personality_scores'] = adjusted_weights
-            print(f"GPT 조정 후 가중치 (총 {len(adjusted_weights)}개): {adjusted_weights}")
-            
+            with stage_timer("recommendation", "weight_adjustment"):
+                adjusted_weights = self._adjust_weights_with_gpt_analysis(
+                    user_weights, 
+                    gpt_result.get('personality_type', ''),
+                    gpt_result.get('description', '')
+                )
         except Exception as e:
-            print(f"GPT 가중치 조정 실패: {e}")
             # GPT 조정 실패 시 원본 가중치 사용
-            print(f"기본 계산된 사용자 가중치 (총 {len(user_weights)}개): {user_weights}")
-            for trait in all_trait_nodes:
-                if trait in ['Extraversion', 'Agreeableness', 'Conscientiousness']:
-                    user_weights[trait] = 0.5
-                elif trait == 'Openness':
-                    user_weights[trait] = 0.7
-                elif trait == 'Neuroticism':
-                    user_weights[trait] = 0.3
-                else:
-                    user_weights[trait] = 0.4
+            logger.warning("GPT 가중치 조정 실패: %s", e)
+            adjusted_weights = user_weights
         
         try:
-            # 추천 엔진 실행
-            engine = self._get_engine()
-            # 1. User 노드를 그래프에 추가
-            user_id = engine.add_user_node(user_weights)
-            # 2. 추천 생성 (더 많은 후보 생성 후 다양성 필터링)
-            recommendations = engine.get_recommendations(user_id, top_k=20)
-            
-            # 3. 다양성 기반 필터링으로 최종 10개 선택
-            diverse_recommendations = self._apply_diversity_filter(recommendations, target_count=10)
-            
-            # 결과 포맷팅
-            formatted_recommendations = []
-            for i, rec in enumerate(diverse_recommendations):
-                # recommendation_engine에서 반환하는 딕셔너리 형태 처리
-                product_id = self._extract_product_id(rec.get('item_id'))
-                formatted_recommendations.append({
-                    "product_id": product_id,
+            # 임베딩/검색/다양성 필터는 스레드풀에서 실행 (NumPy 연산 중 GIL 해제, 이벤트 루프 비차단)
+            formatted_recommendations = await run_in_threadpool(self._recommend, session_id, adjusted_weights)
+        except Exception as e:
+            return {
+                "success": False,
+                "data": None,
+                "error": {"code": "RECOMMENDATION_ERROR", "message": f"추천 생성 실패: {str(e)}"}
+            }
+        
+        data = {
+            "recommendations": formatted_recommendations,
+            "personality_analysis": {
+                "personality_type": gpt_result["personality_type"],
+                "description": gpt_result["description"]
+            },
+            "user_name": session['user_info']['name'],
+            "traits": user_weights
+        }
+        
+        # GPT 기본 문구로 만든 결과는 저장하지 않고 다음 요청에서 재시도
+        if cacheable:
+            with stage_timer("recommendation", "session_save"):
+                await run_in_threadpool(
+                    self._update_session, session_id, answers_version,
+                    recommendation_cache={"answers_version": answers_version, "data": data}
+                )
+        
+        return {"success": True, "data": self._expand_result(data, expand)}
+    
+    def _recommend(self, session_id, user_weights):
+        """User 임베딩 생성 → 후보 검색 → 다양성 필터 → 상품 ID 매핑"""
+        engine = self._get_engine()
+        # 1. User 임베딩 생성 (세션 ID 기준으로 저장소에 보관)
+        with stage_timer("recommendation", "user_embedding"):
+            user_id = engine.add_user_node(user_weights, user_key=session_id)
+        # 2. 추천 생성 (더 많은 후보 생성 후 다양성 필터링)
+        with stage_timer("recommendation", "retrieval"):
+            recommendations = engine.get_recommendations(
+                user_id, top_k=RECOMMENDATION_CONFIG["diversity_candidate_pool"]
+            )
+        
+        # 3. 다양성 기반 필터링으로 최종 10개 선택
+        with stage_timer("recommendation", "diversity_filter"):
+            diverse_recommendations = self._apply_diversity_filter(
+                recommendations, target_count=RECOMMENDATION_CONFIG["top_k"]
+            )
+        
+        # 결과 포맷팅
+        with stage_timer("recommendation", "product_mapping"):
+            return [
+                {
+                    "product_id": self._extract_product_id(rec.get('item_id')),
                     "score": float(rec.get('similarity', 0)),
                     "rank": i + 1
-                })
-            
-            # GPT를 통한 최종 성격 분석 추가
-            try:
-                user_name = session['user_info']['name']
-                all_answers = session.get('answers', [])
-                gpt_result = self.gpt_service.generate_final_result(user_weights, user_name, all_answers)
-                
-                return {
-                    "success": True,
-                    "data": {
-                        "recommendations": formatted_recommendations,
-                        "personality_analysis": {
-                            "personality_type": gpt_result["personality_type"],
-                            "description": gpt_result["description"]
-                        },
-                        "user_name": session['user_info']['name'],
-                        "traits": user_weights
-                    }
                 }
-            except Exception as gpt_error:
-                print(f"GPT 최종 분석 오류: {gpt_error}")
-                # GPT 오류 시에도 추천 결과는 반환
-                return {
-                    "success": True,
-                    "data": {
-                        "recommendations": formatted_recommendations,
-                        "personality_analysis": {
-                            "personality_type": "매력적인 개성",
-                            "description": f"{session['user_info']['name']}님만의 특별한 매력이 돋보입니다."
-                        },
-                        "user_name": session['user_info']['name'],
-                        "traits": user_weights
-                    }
-                }
-            
+                for i, rec in enumerate(diverse_recommendations)
+            ]
+    
+    def _update_session(self, session_id, answers_version, **fields):
+        """최신 세션에 결과 기록 (생성 중 새 답변이 제출되어 버전이 바뀌었으면 기록하지 않음)
+
+        세션 lock 대기와 저장소 I/O가 있으므로 이벤트 루프에서는 run_in_threadpool로 호출한다.
+        """
+        # GPT 대기 중 다른 요청이 세션을 갱신했을 수 있으므로 lock 안에서 다시 조회
+        with session_lock(session_id):
+            session = session_store.get(session_id)
+            if session is None or session.get('answers_version', 0) != answers_version:
+                return False
+            session.update(fields)
+            session_store.save(session_id, session)
+        return True
+    
+    def _expand_result(self, data, expand):
+        """expand=product: 상품 요약 정보를 함께 반환 (상품 상세 API 추가 호출 불필요, 저장된 결과는 변경하지 않음)"""
+        if expand != "product":
+            return data
+        with stage_timer("recommendation", "product_hydration"):
+            recommendations = self._hydrate_products([dict(rec) for rec in data["recommendations"]])
+        return {**data, "recommendations": recommendations}
+    
+    def _hydrate_products(self, recommendations):
+        """추천 결과에 상품 이름, 가격, 대표 이미지, 설명 일부를 결합"""
+        summaries = product_service._load_products().get_summaries(
+            [rec["product_id"] for rec in recommendations]
+        )
+        for rec in recommendations:
+            rec["product"] = summaries.get(rec["product_id"])
+        return recommendations
+    
+    async def _get_final_analysis(self, session_id, session, user_weights):
+        """GPT 최종 분석을 세션에 저장해 재사용, (분석 결과, 저장 여부) 반환 (새 답변 제출 시 TestService.submit에서 무효화)"""
+        cached = session.get('final_analysis')
+        if cached is not None:
+            return cached, True
+        
+        gpt_result = await self.gpt_service.generate_final_result(
+            user_weights,
+            session['user_info']['name'],
+            session.get('answers', [])
+        )
+        # GPT 오류로 기본 문구가 반환된 경우에는 저장하지 않고 다음 요청에서 재시도
+        if gpt_result.pop('is_fallback', False):
+            return gpt_result, False
+        await run_in_threadpool(
+            self._update_session, session_id, session.get('answers_version', 0), final_analysis=gpt_result
+        )
+        return gpt_result, True
+    
+    def get_batch_recommendations(self, session_ids, top_k: int = 10) -> Dict[str, Any]:
+        """여러 세션의 추천을 한 번의 행렬 연산으로 일괄 생성 (GPT 조정 없이 저장된 성격 점수 사용)"""
+        results = []
+        ready_session_ids = []
+        ready_weights = []
+        
+        for session_id in session_ids:
+            session = session_store.get(session_id)
+            if session is None:
+                results.append({
+                    "session_id": session_id,
+                    "success": False,
+                    "error": {"code": "SESSION_NOT_FOUND", "message": "세션을 찾을 수 없습니다."}
+                })
+            elif not session.get('personality_scores'):
+                results.append({
+                    "session_id": session_id,
+                    "success": False,
+                    "error": {"code": "NO_PERSONALITY_DATA", "message": "성격 분석 결과가 없습니다. 먼저 심리테스트를 완료해주세요."}
+                })
+            else:
+                results.append(None)
+                ready_session_ids.append(session_id)
+                ready_weights.append(session['personality_scores'])
+        
+        try:
+            engine = self._get_engine()
+            # 다양성 필터링을 위한 후보를 한 번에 생성
+            candidate_pool = max(top_k, RECOMMENDATION_CONFIG["diversity_candidate_pool"])
+            batch_recommendations = engine.get_batch_recommendations(
+                ready_weights, top_k=candidate_pool, seed_keys=ready_session_ids
+            )
         except Exception as e:
             return {
                 "success": False,
                 "data": None,
-                "error": {"code": "RECOMMENDATION_ERROR", "message": f"추천 생성 실패: {str(e)}"}
+                "error": {"code": "RECOMMENDATION_ERROR", "message": f"일괄 추천 생성 실패: {str(e)}"}
+            }
+        
+        ready_results = iter(zip(ready_session_ids, batch_recommendations))
+        for i, result in enumerate(results):
+            if result is not None:
+                continue
+            session_id, recommendations = next(ready_results)
+            diverse_recommendations = self._apply_diversity_filter(recommendations, target_count=top_k)
+            results[i] = {
+                "session_id": session_id,
+                "success": True,
+                "recommendations": [
+                    {
+                        "product_id": self._extract_product_id(rec.get('item_id')),
+                        "score": float(rec.get('similarity', 0)),
+                        "rank": rank + 1
+                    }
+                    for rank, rec in enumerate(diverse_recommendations)
+                ]
+            }
+        
+        return {
+            "success": True,
+            "data": {
+                "total": len(results),
+                "succeeded": len(ready_session_ids),
+                "results": results
             }
+        }
     
     def _adjust_weights_with_gpt_analysis(self, base_weights, personality_type, description):
         """GPT 분석 결과를 바탕으로 가중치 조정"""
@@ -324,72 +491,33 @@ class RecommendationService:
                 adjusted_weights[trait] = max(0.0, min(1.0, new_value))  # 0-1 범위로 클리핑
         
         # 조정 내역 로깅
-        changes = []
-        for trait, adjustment in adjustments.items():
-            if trait in base_weights:
-                old_val = base_weights[trait]
-                new_val = adjusted_weights[trait]
-                if abs(old_val - new_val) > 0.01:
-                    changes.append(f"{trait}: {old_val:.2f} -> {new_val:.2f}")
-        
-        if changes:
-            print(f"GPT 기반 가중치 조정: {', '.join(changes)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            changed = sum(
+                1 for trait in adjustments
+                if trait in base_weights and abs(base_weights[trait] - adjusted_weights[trait]) > 0.01
+            )
+            logger.debug("GPT 기반 가중치 조정: %d개 특성 변경", changed)
         
         return adjusted_weights
     
     def _apply_diversity_filter(self, recommendations, target_count=10):
-        """추천 결과에 다양성 필터링 적용"""
+        """후보 임베딩 기반 MMR 재정렬로 유사한 상품이 몰리지 않도록 target_count개 선택"""
         if len(recommendations) <= target_count:
             return recommendations
         
         try:
             engine = self._get_engine()
-            selected = [recommendations[0]]  # 첫 번째(가장 높은 점수)는 항상 포함
-            
-            for candidate in recommendations[1:]:
-                if len(selected) >= target_count:
-                    break
-                
-                # 현재 선택된 아이템들과의 평균 유사도 계산
-                candidate_id = candidate['item_id']
-                if candidate_id not in engine.model['node_embeddings']:
-                    selected.append(candidate)
-                    continue
-                
-                candidate_emb = engine.model['node_embeddings'][candidate_id]
-                similarities = []
-                
-                for selected_rec in selected:
-                    selected_id = selected_rec['item_id']
-                    if selected_id in engine.model['node_embeddings']:
-                        selected_emb = engine.model['node_embeddings'][selected_id]
-                        from sklearn.metrics.pairwise import cosine_similarity
-                        sim = cosine_similarity(
-                            candidate_emb.reshape(1, -1),
-                            selected_emb.reshape(1, -1)
-                        )[0][0]
-                        similarities.append(sim)
-                
-                # 평균 유사도가 임계값 이하인 경우만 선택
-                avg_similarity = sum(similarities) / len(similarities) if similarities else 0
-                similarity_threshold = 0.6  # 조정 가능한 임계값
-                
-                if avg_similarity < similarity_threshold:
-                    selected.append(candidate)
-                    print(f"다양성 필터: 아이템 {candidate_id} 선택 (평균 유사도: {avg_similarity:.3f})")
-            
-            # 목표 개수에 못 미치는 경우 나머지 채우기
-            while len(selected) < target_count and len(selected) < len(recommendations):
-                for candidate in recommendations:
-                    if candidate not in selected:
-                        selected.append(candidate)
-                        break
-            
-            print(f"다양성 필터링 완료: {len(recommendations)} -> {len(selected)}개")
-            return selected
+            relevance = [rec['similarity'] for rec in recommendations]
+            vectors = engine.get_item_vectors([rec['item_id'] for rec in recommendations])
+            selected = mmr_rerank(
+                relevance, vectors, target_count,
+                diversity_lambda=RECOMMENDATION_CONFIG["diversity_lambda"]
+            )
+            logger.debug("다양성 필터링 완료: %d -> %d개", len(recommendations), len(selected))
+            return [recommendations[idx] for idx in selected]
             
         except Exception as e:
-            print(f"다양성 필터링 오류: {e}")
+            logger.warning("다양성 필터링 오류: %s", e)
             return recommendations[:target_count]
     
     def _enhance_weight_differences(self, weights):
@@ -434,83 +562,103 @@ class RecommendationService:
 
 class ProductService:
     def __init__(self):
-        self.products_df = None
+        self.catalog = None
+        self._lock = threading.Lock()
         
     def _load_products(self):
-        """상품 데이터 lazy loading"""
-        if self.products_df is None:
-            import pandas as pd
-            from pathlib import Path
-            products_path = Path(__file__).parent.parent / "data" / "products" / "products.csv"
-            self.products_df = pd.read_csv(products_path)
-        return self.products_df
+        """상품 카탈로그 lazy loading (동시 요청에서도 한 번만 로드)"""
+        if self.catalog is None:
+            with self._lock:
+                if self.catalog is None:
+                    self.catalog = ProductCatalog().load()
+        return self.catalog
     
-    def get_product(self, product_id: str) -> Dict[str, Any]:
+    def _parse_product_id(self, product_id):
+        """상품 ID를 정수로 변환 (실패 시 None)"""
         try:
-            # 상품 ID를 정수로 변환 시도
-            product_id_int = int(product_id)
-        except ValueError:
+            return int(product_id)
+        except (ValueError, TypeError):
+            return None
+    
+    def get_product(self, product_id: str) -> Dict[str, Any]:
+        # 상품 ID를 정수로 변환 시도
+        product_id_int = self._parse_product_id(product_id)
+        if product_id_int is None:
             return {
                 "success": False,
                 "data": None,
                 "error": {"code": "INVALID_PRODUCT_ID", "message": "잘못된 상품 ID입니다."}
             }
         
-        products_df = self._load_products()
-        product = products_df[products_df['product_id'] == product_id_int]
-        
-        if product.empty:
+        product_data = self._load_products().get(product_id_int)
+        if product_data is None:
             return {
                 "success": False,
                 "data": None,
                 "error": {"code": "PRODUCT_NOT_FOUND", "message": "상품을 찾을 수 없습니다."}
             }
         
-        # 상품 데이터 정리
-        product_data = product.iloc[0].to_dict()
-        
-        # NaN 값을 None으로 변환
-        import pandas as pd
-        for key, value in product_data.items():
-            if pd.isna(value):
-                product_data[key] = None
+        return {
+            "success": True,
+            "data": dict(product_data)
+        }
+    
+    def get_product_payload(self, product_id: str) -> Optional[bytes]:
+        """성공 응답 JSON 바이트 (미리 직렬화된 레코드 사용, 없으면 None)"""
+        product_id_int = self._parse_product_id(product_id)
+        if product_id_int is None:
+            return None
+        record_json = self._load_products().get_json(product_id_int)
+        if record_json is None:
+            return None
+        return b'{"success":true,"data":' + record_json + b',"error":null}'
+    
+    def get_products(self, product_ids) -> Dict[str, Any]:
+        """여러 상품을 한 번에 조회 (요청 순서 유지, 없는 ID는 missing에 포함)"""
+        parsed_ids = [self._parse_product_id(product_id) for product_id in product_ids]
+        found = self._load_products().get_many(parsed_ids)
+        products = []
+        missing = []
+        for product_id, product_id_int in zip(product_ids, parsed_ids):
+            product_data = found.get(product_id_int)
+            if product_data is None:
+                missing.append(str(product_id))
+            else:
+                products.append(dict(product_data))
         
         return {
             "success": True,
-            "data": product_data
+            "data": {
+                "products": products,
+                "missing": missing
+            }
         }
 
 class IntermediateService:
-    def __init__(self):
-        self.gpt_service = GPTService()
+    def __init__(self, gpt_service):
+        self.gpt_service = gpt_service
     
-    def get_intermediate_result(self, session_id: str) -> Dict[str, Any]:
+    async def get_intermediate_result(self, session_id: str) -> Dict[str, Any]:
         """중간 결과 생성 - GPT 기반 성격 분석"""
         try:
-            print(f"중간 결과 요청: session_id={session_id}")
-            print(f"현재 세션 목록: {list(sessions.keys())}")
-            
-            if session_id not in sessions:
-                print(f"세션 없음: {session_id}")
+            session_data = await run_in_threadpool(session_store.get, session_id)
+            if session_data is None:
                 return {
                     "success": False,
                     "error": "세션을 찾을 수 없습니다."
                 }
             
-            session_data = sessions[session_id]
-            print(f"세션 데이터: {session_data}")
             user_name = session_data['user_info'].get('name', '사용자')
             
             # 현재까지의 답변이 있는지 확인
             answers = session_data.get('answers', [])
             if len(answers) < 3:  # 최소 3개 답변은 있어야 분석 가능
-                print(f"답변 부족: {len(answers)}개")
                 return {
                     "success": False,
                     "error": "아직 분석할 데이터가 충분하지 않습니다."
                 }
             
-            print(f"GPT 호출 시작: user_name={user_name}, answers={len(answers)}개")
+            logger.debug("중간 결과 GPT 호출: 답변 %d개", len(answers))
             
             # 답변 내용을 GPT가 분석할 수 있도록 정리
             answer_summary = []
@@ -518,13 +666,11 @@ class IntermediateService:
                 answer_summary.append(f"질문: {answer.get('target_node', '알 수 없음')} 관련, 답변: {answer.get('answer', '없음')}")
             
             # GPT로 중간 결과 생성 (답변 내용 직접 전달)
-            gpt_result = self.gpt_service.generate_intermediate_result_from_answers(
+            gpt_result = await self.gpt_service.generate_intermediate_result_from_answers(
                 answer_summary, 
                 user_name
             )
             
-            print(f"GPT 결과: {gpt_result}")
-            
             return {
                 "success": True,
                 "data": {
@@ -537,18 +683,35 @@ class IntermediateService:
             }
             
         except Exception as e:
-            print(f"IntermediateService 오류: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("중간 결과 생성 오류")
             return {
                 "success": False,
                 "data": None,
                 "error": f"중간 결과 생성 중 오류가 발생했습니다: {str(e)}"
             }
 
+def warm_up_services(timings: Optional[Dict[str, float]] = None) -> Dict[str, float]:
+    """추천 엔진, 노드 매핑, 상품 카탈로그, 질문 구조 사전 로드 (단계별 소요 시간 기록)"""
+    if timings is None:
+        timings = {}
+    
+    stages = [
+        ("recommendation_engine", recommendation_service._get_engine),
+        ("entity_mapping", lambda: recommendation_service._get_engine().node_index.check_consistency()),
+        ("product_catalog", product_service._load_products),
+        ("question_structure", test_service._load_questions),
+        ("scoring_calculator", test_service._get_calculator),
+    ]
+    for stage, load in stages:
+        started = time.perf_counter()
+        load()
+        timings[stage] = time.perf_counter() - started
+    
+    return timings
+
 # 서비스 인스턴스 생성
 user_service = UserService()
 test_service = TestService()
-recommendation_service = RecommendationService()
+recommendation_service = RecommendationService(gpt_service)
 product_service = ProductService()
-intermediate_service = IntermediateService()
\ No newline at end of file
+intermediate_service = IntermediateService(gpt_service)
\ No newline at end of file
@@ -0,0 +1,206 @@
+"""
+세션 저장소 - 메모리(TTL/LRU) 또는 SQLite(WAL, 여러 워커 프로세스 공유) 백엔드
+
+get()으로 받은 세션 dict를 수정한 뒤에는 반드시 save()로 다시 저장한다.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+class MemorySessionStore:
+    """프로세스 내 세션 저장소 (마지막 접근 기준 TTL + 최대 개수 LRU)"""
+
+    def __init__(self, max_entries=10000, ttl_seconds=21600, on_evict: Optional[Callable[[str], Any]] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.on_evict = on_evict
+        # session_id -> (세션 dict, 만료 시각), 오래 사용되지 않은 순서로 정렬
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                return None
+            session, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[session_id]
+                self.expirations += 1
+                expired = True
+            else:
+                self._entries[session_id] = (session, time.time() + self.ttl_seconds)
+                self._entries.move_to_end(session_id)
+                expired = False
+        if expired:
+            self._notify([session_id])
+            return None
+        return session
+
+    def save(self, session_id: str, session: Dict[str, Any]):
+        with self._lock:
+            self._entries.pop(session_id, None)
+            self._entries[session_id] = (session, time.time() + self.ttl_seconds)
+            evicted = []
+            while len(self._entries) > self.max_entries:
+                evicted.append(self._entries.popitem(last=False)[0])
+            self.evictions += len(evicted)
+        self._notify(evicted)
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            removed = self._entries.pop(session_id, None) is not None
+        if removed:
+            self._notify([session_id])
+        return removed
+
+    def purge_expired(self) -> List[str]:
+        """만료된 세션 일괄 제거 후 제거된 ID 목록 반환"""
+        now = time.time()
+        with self._lock:
+            expired = [session_id for session_id, (_, expires_at) in self._entries.items() if expires_at <= now]
+            for session_id in expired:
+                del self._entries[session_id]
+            self.expirations += len(expired)
+        self._notify(expired)
+        return expired
+
+    def _notify(self, session_ids):
+        if self.on_evict is not None:
+            for session_id in session_ids:
+                self.on_evict(session_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": type(self).__name__,
+            "entries": len(self),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
+
+    def __contains__(self, session_id):
+        return self.get(session_id) is not None
+
+    def __len__(self):
+        return len(self._entries)
+
+class SQLiteSessionStore(MemorySessionStore):
+    """파일 기반 SQLite 세션 저장소 (재시작 후 유지, 여러 uvicorn 워커가 같은 파일 공유)"""
+
+    def __init__(self, path, max_entries=100000, ttl_seconds=21600, on_evict: Optional[Callable[[str], Any]] = None):
+        super().__init__(max_entries=max_entries, ttl_seconds=ttl_seconds, on_evict=on_evict)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connect()
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "session_id TEXT PRIMARY KEY, data TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions (expires_at)")
+        self._conn.commit()
+        # SQLite 연결은 fork 후 공유할 수 없으므로 워커 프로세스에서 새로 연결
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._connect)
+
+    def _connect(self):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=5.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+
+    @staticmethod
+    def _dumps(session):
+        return json.dumps(session, ensure_ascii=False, separators=(',', ':'))
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, expires_at FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+                self._conn.commit()
+                self.expirations += 1
+            else:
+                self._conn.execute(
+                    "UPDATE sessions SET expires_at = ? WHERE session_id = ?", (now + self.ttl_seconds, session_id)
+                )
+                self._conn.commit()
+                return json.loads(row[0])
+        self._notify([session_id])
+        return None
+
+    def save(self, session_id: str, session: Dict[str, Any]):
+        data = self._dumps(session)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sessions (session_id, data, expires_at) VALUES (?, ?, ?)",
+                (session_id, data, time.time() + self.ttl_seconds)
+            )
+            evicted = []
+            overflow = self._count() - self.max_entries
+            if overflow > 0:
+                evicted = [row[0] for row in self._conn.execute(
+                    "SELECT session_id FROM sessions ORDER BY expires_at LIMIT ?", (overflow,)
+                )]
+                self._conn.executemany("DELETE FROM sessions WHERE session_id = ?", [(sid,) for sid in evicted])
+                self.evictions += len(evicted)
+            self._conn.commit()
+        self._notify(evicted)
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            removed = self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,)).rowcount > 0
+            self._conn.commit()
+        if removed:
+            self._notify([session_id])
+        return removed
+
+    def purge_expired(self) -> List[str]:
+        now = time.time()
+        with self._lock:
+            expired = [row[0] for row in self._conn.execute(
+                "SELECT session_id FROM sessions WHERE expires_at <= ?", (now,)
+            )]
+            self._conn.execute("DELETE FROM sessions WHERE expires_at <= ?", (now,))
+            self._conn.commit()
+            self.expirations += len(expired)
+        self._notify(expired)
+        return expired
+
+    def _count(self):
+        return self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def __len__(self):
+        with self._lock:
+            return self._count()
+
+def create_session_store(config, on_evict: Optional[Callable[[str], Any]] = None):
+    """설정에 따라 세션 저장소 생성 (backend: memory | sqlite)"""
+    backend_name = config.get("backend", "memory")
+    if backend_name == "sqlite":
+        return SQLiteSessionStore(
+            config["sqlite_path"],
+            max_entries=config["max_entries"],
+            ttl_seconds=config["ttl_seconds"],
+            on_evict=on_evict
+        )
+    if backend_name == "memory":
+        return MemorySessionStore(
+            max_entries=config["max_entries"],
+            ttl_seconds=config["ttl_seconds"],
+            on_evict=on_evict
+        )
+    raise ValueError(f"지원하지 않는 세션 저장소 백엔드: {backend_name}")
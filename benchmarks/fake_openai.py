@@ -0,0 +1,57 @@
+"""
+부하 테스트용 가짜 OpenAI 서버 - /v1/chat/completions에 지연 후 고정 형식의 응답 반환
+
+실제 API 호출 없이 GPT 대기 시간을 흉내 낸다. 서버 실행 시 OPENAI_BASE_URL로 지정한다.
+
+    python benchmarks/fake_openai.py --port 8100 --delay 0.8 --jitter 0.3
+    OPENAI_API_KEY=x OPENAI_BASE_URL=http://127.0.0.1:8100/v1 python -m app.main --workers 4
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+from fastapi import FastAPI
+
+app = FastAPI(title="Fake OpenAI")
+stats = {"calls": 0}
+
+def _delay():
+    delay = float(os.environ.get("FAKE_OPENAI_DELAY", "0.5"))
+    jitter = float(os.environ.get("FAKE_OPENAI_JITTER", "0.0"))
+    return max(0.0, delay + random.uniform(-jitter, jitter))
+
+@app.post("/v1/chat/completions")
+async def chat_completions(body: dict):
+    stats["calls"] += 1
+    await asyncio.sleep(_delay())
+    return {
+        "id": f"chatcmpl-fake-{stats['calls']}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "fake"),
+        "choices": [{
+            "index": 0,
+            "finish_reason": "stop",
+            "message": {"role": "assistant", "content": "성격유형: 따뜻한 탐험가\n설명: 부하 테스트용 고정 응답입니다."}
+        }],
+        "usage": {"prompt_tokens": 300, "completion_tokens": 40, "total_tokens": 340}
+    }
+
+@app.get("/stats")
+async def get_stats():
+    return stats
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="가짜 OpenAI 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--delay", type=float, default=0.5, help="응답 지연 (초)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="지연 편차 (±초)")
+    args = parser.parse_args()
+
+    os.environ["FAKE_OPENAI_DELAY"] = str(args.delay)
+    os.environ["FAKE_OPENAI_JITTER"] = str(args.jitter)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
@@ -0,0 +1,274 @@
+"""
+부하 테스트 - 실제 사용자 흐름을 비동기로 동시 실행해 엔드포인트별 지연시간 분포와 오류율 측정
+
+한 명의 사용자 흐름(journey):
+    POST /api/user/info → GET /api/test/questions → POST /api/test/submit (단계별)
+    → 중간에 GET /api/intermediate/{id} → GET /api/recommendation/{id} → GET /api/products/{id} (여러 개)
+
+--concurrency 개의 가상 사용자가 흐름을 끝내는 즉시 다음 흐름을 시작한다 (closed-loop).
+--spawn을 지정하면 가짜 OpenAI 서버와 앱 서버를 직접 띄운 뒤 측정한다.
+
+    python benchmarks/load_test.py --spawn --workers 4 --journeys 500 --concurrency 50
+    python benchmarks/load_test.py --base-url http://127.0.0.1:8000 --journeys 200 --concurrency 20 --json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import httpx
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+ENDPOINTS = ("user_info", "questions", "submit", "intermediate", "recommendation", "product")
+
+class JourneyRecorder:
+    """엔드포인트별 (지연시간, 성공 여부) 기록"""
+
+    def __init__(self):
+        self.samples = {name: [] for name in ENDPOINTS}
+        self.journeys = []
+        self.failed_journeys = 0
+        self.error_examples = {}
+
+    def record(self, endpoint, elapsed, ok, detail=None):
+        self.samples[endpoint].append((elapsed, ok))
+        if not ok and detail is not None:
+            self.error_examples.setdefault(endpoint, detail)
+
+def _is_success(response):
+    if response.status_code != 200:
+        return False
+    try:
+        return bool(response.json().get("success"))
+    except ValueError:
+        return False
+
+async def _request(client, recorder, endpoint, method, url, **kwargs):
+    """요청 1회 수행 후 기록, 실패 시 None 반환"""
+    started = time.perf_counter()
+    try:
+        response = await client.request(method, url, **kwargs)
+    except httpx.HTTPError as e:
+        recorder.record(endpoint, time.perf_counter() - started, False, repr(e))
+        return None
+    ok = _is_success(response)
+    recorder.record(endpoint, time.perf_counter() - started, ok, f"{response.status_code} {response.text[:200]}")
+    return response.json() if ok else None
+
+async def run_journey(client, recorder, index, args):
+    """사용자 한 명의 전체 흐름 (중간 단계 실패 시 중단)"""
+    rng = random.Random(args.seed + index)
+    started = time.perf_counter()
+
+    body = await _request(client, recorder, "user_info", "POST", "/api/user/info", json={
+        "name": f"부하테스트{index}", "gender": rng.choice(["M", "F"]), "age": rng.randint(15, 70),
+        "city": "서울", "date": "1990-12-25", "time": "12:00"
+    })
+    if body is None:
+        return False
+    session_id = body["data"]["session_id"]
+
+    body = await _request(client, recorder, "questions", "GET", "/api/test/questions")
+    if body is None:
+        return False
+    answers = [
+        {
+            "question_id": question["id"],
+            "question_type": question["question_type"],
+            "target_node": question["target_node"],
+            "answer": rng.choice(question["choices"])
+        }
+        for question in body["data"]["questions"]
+    ]
+
+    steps = args.submit_steps
+    step_size = -(-len(answers) // steps)
+    for step in range(steps):
+        body = await _request(client, recorder, "submit", "POST", "/api/test/submit", json={
+            "session_id": session_id,
+            "answers": answers[step * step_size:(step + 1) * step_size],
+            "progress": {"current_step": step + 1, "total_steps": steps, "is_final": step == steps - 1}
+        })
+        if body is None:
+            return False
+        if step == steps // 2 - 1:
+            if await _request(client, recorder, "intermediate", "GET", f"/api/intermediate/{session_id}") is None:
+                return False
+
+    body = await _request(client, recorder, "recommendation", "GET", f"/api/recommendation/{session_id}")
+    if body is None:
+        return False
+    for rec in body["data"]["recommendations"][:args.product_lookups]:
+        await _request(client, recorder, "product", "GET", f"/api/products/{rec['product_id']}")
+
+    recorder.journeys.append(time.perf_counter() - started)
+    return True
+
+async def run_load(args):
+    recorder = JourneyRecorder()
+    next_index = iter(range(args.journeys))
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        async def virtual_user():
+            for index in next_index:
+                if not await run_journey(client, recorder, index, args):
+                    recorder.failed_journeys += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(virtual_user() for _ in range(args.concurrency)))
+        wall_seconds = time.perf_counter() - started
+
+    return recorder, wall_seconds
+
+def _distribution(latencies):
+    values = np.asarray(latencies, dtype=np.float64) * 1000
+    return {
+        "p50_ms": float(np.percentile(values, 50)),
+        "p95_ms": float(np.percentile(values, 95)),
+        "p99_ms": float(np.percentile(values, 99)),
+        "max_ms": float(values.max())
+    }
+
+def build_report(recorder, wall_seconds, args):
+    endpoints = {}
+    for name, samples in recorder.samples.items():
+        if not samples:
+            continue
+        errors = sum(1 for _, ok in samples if not ok)
+        endpoints[name] = {
+            "requests": len(samples),
+            "errors": errors,
+            "error_rate": errors / len(samples),
+            "rps": len(samples) / wall_seconds,
+            **_distribution([elapsed for elapsed, _ in samples])
+        }
+    total_requests = sum(row["requests"] for row in endpoints.values())
+    total_errors = sum(row["errors"] for row in endpoints.values())
+    return {
+        "config": {
+            "base_url": args.base_url,
+            "journeys": args.journeys,
+            "concurrency": args.concurrency,
+            "submit_steps": args.submit_steps,
+            "product_lookups": args.product_lookups,
+            "seed": args.seed
+        },
+        "wall_seconds": wall_seconds,
+        "completed_journeys": len(recorder.journeys),
+        "failed_journeys": recorder.failed_journeys,
+        "journeys_per_s": len(recorder.journeys) / wall_seconds,
+        "journey": _distribution(recorder.journeys) if recorder.journeys else None,
+        "requests": total_requests,
+        "error_rate": total_errors / total_requests if total_requests else 0.0,
+        "rps": total_requests / wall_seconds,
+        "endpoints": endpoints,
+        "error_examples": recorder.error_examples
+    }
+
+def print_report(report):
+    print(
+        f"journey {report['completed_journeys']}/{report['config']['journeys']} 완료 "
+        f"(실패 {report['failed_journeys']}), 동시 사용자 {report['config']['concurrency']}, "
+        f"{report['wall_seconds']:.1f}초, {report['journeys_per_s']:.1f} journey/s, {report['rps']:.1f} req/s"
+    )
+    if report["journey"]:
+        journey = report["journey"]
+        print(f"journey 전체: p50 {journey['p50_ms']:.0f} ms / p95 {journey['p95_ms']:.0f} ms / p99 {journey['p99_ms']:.0f} ms")
+    print(f"{'endpoint':>15} {'요청':>7} {'오류율':>7} {'req/s':>8} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}")
+    for name, row in report["endpoints"].items():
+        print(
+            f"{name:>15} {row['requests']:>7} {row['error_rate']:>7.1%} {row['rps']:>8.1f} "
+            f"{row['p50_ms']:>7.1f}ms {row['p95_ms']:>7.1f}ms {row['p99_ms']:>7.1f}ms {row['max_ms']:>7.1f}ms"
+        )
+    for name, detail in report["error_examples"].items():
+        print(f"오류 예시 [{name}]: {detail}")
+
+def _wait_ready(url, timeout):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=2) as response:
+                if response.status == 200:
+                    return True
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        time.sleep(0.2)
+    return False
+
+def spawn_servers(args):
+    """가짜 OpenAI 서버와 앱 서버 실행 (측정 후 종료할 프로세스 목록 반환)"""
+    fake_port = args.port + 1
+    fake = subprocess.Popen([
+        sys.executable, str(PROJECT_ROOT / "benchmarks" / "fake_openai.py"),
+        "--port", str(fake_port), "--delay", str(args.fake_delay), "--jitter", str(args.fake_jitter)
+    ])
+    env = dict(os.environ)
+    env.setdefault("OPENAI_API_KEY", "benchmark")
+    env["OPENAI_BASE_URL"] = f"http://127.0.0.1:{fake_port}/v1"
+    if args.workers > 1:
+        # 멀티 워커는 워커 간 세션 공유가 필요 (memory 저장소면 서버가 시작하지 않음)
+        env["SESSION_BACKEND"] = "sqlite"
+    server = subprocess.Popen([
+        sys.executable, "-m", "app.main",
+        "--host", "127.0.0.1", "--port", str(args.port), "--workers", str(args.workers), "--log-level", "warning"
+    ], cwd=PROJECT_ROOT, env=env)
+    processes = [server, fake]
+
+    if not (_wait_ready(f"http://127.0.0.1:{fake_port}/stats", args.startup_timeout)
+            and _wait_ready(f"{args.base_url}/ready", args.startup_timeout)):
+        stop_servers(processes)
+        raise RuntimeError(f"서버가 {args.startup_timeout}초 안에 준비되지 않았습니다.")
+    return processes
+
+def stop_servers(processes):
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        try:
+            process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+def main():
+    parser = argparse.ArgumentParser(description="사용자 흐름 부하 테스트")
+    parser.add_argument("--base-url", help="대상 서버 주소 (기본: http://127.0.0.1:<port>)")
+    parser.add_argument("--journeys", type=int, default=200, help="전체 사용자 흐름 수")
+    parser.add_argument("--concurrency", type=int, default=20, help="동시 가상 사용자 수")
+    parser.add_argument("--submit-steps", type=int, default=4, help="답변 제출 단계 수")
+    parser.add_argument("--product-lookups", type=int, default=3, help="추천 후 조회할 상품 수")
+    parser.add_argument("--timeout", type=float, default=60.0, help="요청 타임아웃 (초)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    parser.add_argument("--spawn", action="store_true", help="가짜 OpenAI 서버와 앱 서버를 직접 실행")
+    parser.add_argument("--port", type=int, default=8000, help="--spawn 시 앱 서버 포트 (가짜 OpenAI는 port+1)")
+    parser.add_argument("--workers", type=int, default=1, help="--spawn 시 앱 서버 워커 수")
+    parser.add_argument("--fake-delay", type=float, default=0.5, help="--spawn 시 가짜 GPT 응답 지연 (초)")
+    parser.add_argument("--fake-jitter", type=float, default=0.2, help="--spawn 시 가짜 GPT 응답 지연 편차 (±초)")
+    parser.add_argument("--startup-timeout", type=float, default=120.0)
+    args = parser.parse_args()
+    args.base_url = args.base_url or f"http://127.0.0.1:{args.port}"
+
+    processes = spawn_servers(args) if args.spawn else []
+    try:
+        recorder, wall_seconds = asyncio.run(run_load(args))
+    finally:
+        stop_servers(processes)
+
+    report = build_report(recorder, wall_seconds, args)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print_report(report)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""
+추천 파이프라인 벤치마크 - 실제 질문 CSV로 만든 합성 세션(전 문항 응답)으로 단계별/엔드투엔드 지연시간 측정
+
+- stages: 점수 계산, User 임베딩, 아이템 검색, 다양성 필터, 상품 정보 결합을 직접 호출해 측정
+- end_to_end: FastAPI TestClient로 사용자 등록 → 답변 제출 → 중간 결과 → 추천 → 상품 조회 (GPT는 고정 응답으로 대체)
+
+    python benchmarks/pipeline.py --sessions 200 --output benchmarks/results/baseline.json
+    python benchmarks/pipeline.py --sessions 200 --compare benchmarks/results/baseline.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+import numpy as np
+
+SUBMIT_STEPS = 4  # 답변 제출 횟수 (프론트엔드의 단계별 제출)
+PRODUCT_LOOKUPS = 3  # 추천 후 상세 조회하는 상품 수
+
+class StubGPTService:
+    """GPT 호출 대신 고정 응답을 반환 (네트워크 지연 제외)"""
+
+    async def generate_final_result(self, user_traits, user_name, all_answers):
+        return {"personality_type": "벤치마크 유형", "description": f"{user_name}님의 벤치마크 결과입니다."}
+
+    async def generate_intermediate_result_from_answers(self, answer_summary, user_name):
+        return {"personality_type": "벤치마크 유형", "description": "중간 결과입니다."}
+
+def synthetic_sessions(n_sessions, seed):
+    """질문 구조의 실제 선택지에서 무작위로 고른 전 문항 답변 목록"""
+    from utils.engines.data_loader import PsychologyDataLoader
+
+    questions = PsychologyDataLoader().create_question_structure()
+    rng = random.Random(seed)
+    return [
+        [
+            {
+                "question_id": question["id"],
+                "question_type": question["question_type"],
+                "target_node": question["target_node"],
+                "answer": rng.choice(question["choices"])
+            }
+            for question in questions
+        ]
+        for _ in range(n_sessions)
+    ]
+
+def summarize(samples):
+    """지연시간 분포(ms)와 순차 처리 기준 초당 처리량"""
+    values = np.asarray(samples, dtype=np.float64)
+    total = values.sum()
+    return {
+        "count": int(len(values)),
+        "mean_ms": float(values.mean() * 1000),
+        "p50_ms": float(np.percentile(values, 50) * 1000),
+        "p95_ms": float(np.percentile(values, 95) * 1000),
+        "p99_ms": float(np.percentile(values, 99) * 1000),
+        "throughput_per_s": float(len(values) / total) if total > 0 else None
+    }
+
+def bench_stages(sessions):
+    """서비스/엔진 단계를 직접 호출해 단계별 시간 측정"""
+    from app.services import recommendation_service, test_service, warm_up_services
+    from utils.config import RECOMMENDATION_CONFIG
+
+    warm_up_services()
+    engine = recommendation_service._get_engine()
+    calculator = test_service._get_calculator()
+    stages = {name: [] for name in ("scoring", "user_embedding", "item_scoring", "diversity_filter", "product_hydration")}
+
+    for i, answers in enumerate(sessions):
+        session_key = f"benchmark-{i}"
+
+        started = time.perf_counter()
+        state = calculator.accumulate(calculator.new_score_state(), answers)
+        weights = calculator.finalize_weights(state)
+        stages["scoring"].append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        engine.add_user_node(weights, user_key=session_key)
+        stages["user_embedding"].append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        candidates = engine.get_recommendations(session_key, top_k=RECOMMENDATION_CONFIG["diversity_candidate_pool"])
+        stages["item_scoring"].append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        selected = recommendation_service._apply_diversity_filter(candidates, target_count=RECOMMENDATION_CONFIG["top_k"])
+        stages["diversity_filter"].append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        formatted = [
+            {"product_id": recommendation_service._extract_product_id(rec["item_id"]), "score": rec["similarity"], "rank": rank + 1}
+            for rank, rec in enumerate(selected)
+        ]
+        recommendation_service._hydrate_products(formatted)
+        stages["product_hydration"].append(time.perf_counter() - started)
+
+        recommendation_service.release_user_embedding(session_key)
+
+    return {name: summarize(samples) for name, samples in stages.items()}
+
+def bench_end_to_end(sessions):
+    """TestClient로 전체 사용자 흐름을 요청하고 엔드포인트별 시간 측정"""
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.services import intermediate_service, recommendation_service
+
+    recommendation_service.gpt_service = StubGPTService()
+    intermediate_service.gpt_service = StubGPTService()
+
+    endpoints = {name: [] for name in ("user_info", "questions", "submit", "intermediate", "recommendation", "product", "journey")}
+    errors = 0
+
+    def timed(name, call):
+        started = time.perf_counter()
+        response = call()
+        endpoints[name].append(time.perf_counter() - started)
+        return response
+
+    with TestClient(app) as client:
+        for i, answers in enumerate(sessions):
+            journey_started = time.perf_counter()
+            response = timed("user_info", lambda: client.post("/api/user/info", json={
+                "name": f"사용자{i}", "gender": "F", "age": 30, "city": "서울", "date": "1995-01-01", "time": "12:00"
+            }))
+            session_id = response.json()["data"]["session_id"]
+            timed("questions", lambda: client.get("/api/test/questions"))
+
+            step_size = -(-len(answers) // SUBMIT_STEPS)
+            for step in range(SUBMIT_STEPS):
+                chunk = answers[step * step_size:(step + 1) * step_size]
+                is_final = step == SUBMIT_STEPS - 1
+                response = timed("submit", lambda: client.post("/api/test/submit", json={
+                    "session_id": session_id,
+                    "answers": chunk,
+                    "progress": {"current_step": step + 1, "total_steps": SUBMIT_STEPS, "is_final": is_final}
+                }))
+                errors += not response.json().get("success")
+                if step == SUBMIT_STEPS // 2 - 1:
+                    timed("intermediate", lambda: client.get(f"/api/intermediate/{session_id}"))
+
+            response = timed("recommendation", lambda: client.get(f"/api/recommendation/{session_id}"))
+            body = response.json()
+            errors += not body.get("success")
+            for rec in (body.get("data") or {}).get("recommendations", [])[:PRODUCT_LOOKUPS]:
+                timed("product", lambda: client.get(f"/api/products/{rec['product_id']}"))
+            endpoints["journey"].append(time.perf_counter() - journey_started)
+
+    results = {name: summarize(samples) for name, samples in endpoints.items() if samples}
+    results["errors"] = errors
+    return results
+
+def compare(current, baseline, threshold):
+    """기준 결과 대비 p50/p95가 threshold 비율 이상 느려진 항목 목록"""
+    regressions = []
+    for section in ("stages", "end_to_end"):
+        for name, stats in current.get(section, {}).items():
+            base = baseline.get(section, {}).get(name)
+            if not isinstance(stats, dict) or not isinstance(base, dict):
+                continue
+            for metric in ("p50_ms", "p95_ms"):
+                if base[metric] > 0 and stats[metric] > base[metric] * (1 + threshold):
+                    regressions.append({
+                        "section": section,
+                        "name": name,
+                        "metric": metric,
+                        "baseline": base[metric],
+                        "current": stats[metric],
+                        "ratio": stats[metric] / base[metric]
+                    })
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="추천 파이프라인 벤치마크")
+    parser.add_argument("--sessions", type=int, default=100, help="합성 세션 수")
+    parser.add_argument("--seed", type=int, default=42, help="답변/노이즈 난수 시드")
+    parser.add_argument("--skip-e2e", action="store_true", help="TestClient 엔드투엔드 측정 생략")
+    parser.add_argument("--output", help="결과 JSON 저장 경로 (없으면 표준 출력)")
+    parser.add_argument("--compare", help="비교할 기준 결과 JSON 경로")
+    parser.add_argument("--threshold", type=float, default=0.2, help="회귀 판정 비율 (0.2 = 20%% 느려짐)")
+    args = parser.parse_args()
+
+    from utils.config import RECOMMENDATION_CONFIG, RETRIEVAL_CONFIG
+
+    # 세션 키 기반 고정 노이즈 (같은 시드면 같은 추천 결과)
+    RECOMMENDATION_CONFIG["noise_mode"] = "session"
+    RECOMMENDATION_CONFIG["noise_seed"] = args.seed
+    sessions = synthetic_sessions(args.sessions, args.seed)
+
+    result = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "sessions": args.sessions,
+            "answers_per_session": len(sessions[0]) if sessions else 0,
+            "seed": args.seed,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "retrieval_index": RETRIEVAL_CONFIG["index"]
+        },
+        "stages": bench_stages(sessions)
+    }
+    if not args.skip_e2e:
+        result["end_to_end"] = bench_end_to_end(sessions)
+
+    output = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(output, encoding="utf-8")
+    else:
+        print(output)
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        regressions = compare(result, baseline, args.threshold)
+        for item in regressions:
+            print(
+                f"회귀: {item['section']}.{item['name']} {item['metric']} "
+                f"{item['baseline']:.3f} → {item['current']:.3f} ms (x{item['ratio']:.2f})",
+                file=sys.stderr
+            )
+        if regressions:
+            sys.exit(1)
+        print(f"기준 대비 회귀 없음 (threshold {args.threshold:.0%})", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+워커당 메모리 비교 - uvicorn --workers(워커별 개별 로드) vs app.main --workers(부모 로드 후 fork)
+
+각 모드로 서버를 띄워 /ready가 될 때까지 기다린 뒤 워커 프로세스별 RSS/PSS/USS를 /proc에서 읽는다.
+RSS는 공유 페이지를 워커마다 중복 집계하므로 실제 사용량은 PSS 합계로 비교한다. (Linux 전용)
+
+    python benchmarks/worker_memory.py --workers 4
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+MODES = {
+    "uvicorn": lambda port, workers: [
+        sys.executable, "-m", "uvicorn", "app.main:app",
+        "--port", str(port), "--workers", str(workers), "--log-level", "warning"
+    ],
+    "prefork": lambda port, workers: [
+        sys.executable, "-m", "app.main",
+        "--port", str(port), "--workers", str(workers), "--log-level", "warning"
+    ],
+}
+
+def _children(pid):
+    """pid의 모든 자손 프로세스 ID"""
+    parents = {}
+    for entry in Path("/proc").iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+        except OSError:
+            continue
+        ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        parents.setdefault(ppid, []).append(int(entry.name))
+
+    descendants = []
+    pending = [pid]
+    while pending:
+        for child in parents.get(pending.pop(), []):
+            descendants.append(child)
+            pending.append(child)
+    return descendants
+
+def _memory(pid):
+    """smaps_rollup 기준 RSS/PSS/USS (MB)"""
+    values = {}
+    for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines()[1:]:
+        key, value = line.split(":", 1)
+        values[key] = int(value.split()[0])
+    uss = values.get("Private_Clean", 0) + values.get("Private_Dirty", 0)
+    return {
+        "rss_mb": values["Rss"] / 1024,
+        "pss_mb": values["Pss"] / 1024,
+        "uss_mb": uss / 1024
+    }
+
+def _cmdline(pid):
+    return Path(f"/proc/{pid}/cmdline").read_bytes().replace(b"\0", b" ").decode(errors="replace").strip()
+
+def _wait_ready(port, workers, timeout):
+    """여러 워커가 모두 준비되도록 /ready 200 응답이 연속으로 나올 때까지 대기"""
+    deadline = time.time() + timeout
+    consecutive = 0
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/ready", timeout=2) as response:
+                consecutive = consecutive + 1 if response.status == 200 else 0
+        except (urllib.error.URLError, ConnectionError, OSError):
+            consecutive = 0
+        if consecutive >= workers * 4:
+            return True
+        time.sleep(0.1)
+    return False
+
+def _exercise(port, requests=20):
+    """상품/질문 데이터가 워커에 실제로 로드되도록 몇 개의 요청 전송"""
+    for _ in range(requests):
+        for path in ("/api/test/questions", "/api/products/1"):
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=5).read()
+            except (urllib.error.URLError, OSError):
+                pass
+
+def measure(mode, workers, port, timeout):
+    env = dict(os.environ)
+    env.setdefault("OPENAI_API_KEY", "benchmark")
+    # prefork는 memory 세션 저장소로 시작하지 않으므로 두 모드 모두 sqlite 세션 사용 (같은 조건 비교)
+    env["SESSION_BACKEND"] = "sqlite"
+    process = subprocess.Popen(MODES[mode](port, workers), cwd=PROJECT_ROOT, env=env)
+    try:
+        if not _wait_ready(port, workers, timeout):
+            raise RuntimeError(f"{mode} 서버가 {timeout}초 안에 준비되지 않았습니다.")
+        _exercise(port)
+        time.sleep(1.0)
+
+        processes = []
+        for pid in [process.pid] + _children(process.pid):
+            cmdline = _cmdline(pid)
+            # uvicorn 멀티프로세스 모드의 resource_tracker는 제외
+            if "resource_tracker" in cmdline:
+                continue
+            processes.append({"pid": pid, "role": "parent" if pid == process.pid else "worker", **_memory(pid)})
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+    worker_rows = [row for row in processes if row["role"] == "worker"]
+    return {
+        "mode": mode,
+        "workers": len(worker_rows),
+        "processes": processes,
+        "avg_worker_rss_mb": sum(row["rss_mb"] for row in worker_rows) / max(len(worker_rows), 1),
+        "avg_worker_uss_mb": sum(row["uss_mb"] for row in worker_rows) / max(len(worker_rows), 1),
+        "total_pss_mb": sum(row["pss_mb"] for row in processes)
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="워커 모드별 메모리 사용량 비교")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=list(MODES))
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args()
+
+    results = [measure(mode, args.workers, args.port + i, args.timeout) for i, mode in enumerate(args.modes)]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for result in results:
+            print(
+                f"{result['mode']:>8}: 워커 {result['workers']}개, "
+                f"워커당 RSS {result['avg_worker_rss_mb']:.1f} MB / USS {result['avg_worker_uss_mb']:.1f} MB, "
+                f"전체 PSS {result['total_pss_mb']:.1f} MB"
+            )
@@ -11,13 +11,19 @@ DATA_DIR = PROJECT_ROOT / "data"
 UTILS_DIR = PROJECT_ROOT / "utils"
 GRAPH_DATA_DIR = UTILS_DIR / "graph_data"
 
+MODEL_DIR = UTILS_DIR / "models"
+
 # 그래프 관련 경로
-GRAPH_PKL_PATH = UTILS_DIR / "models" / "recommendation_graph.pkl"
-EMBEDDINGS_PKL_PATH = UTILS_DIR / "models" / "embeddings.pkl"
+GRAPH_PKL_PATH = MODEL_DIR / "recommendation_graph.pkl"
+EMBEDDINGS_PKL_PATH = MODEL_DIR / "embeddings.pkl"
+COMPACT_MODEL_DIR = MODEL_DIR / "compact"  # model_store로 변환한 memory-map 포맷
 ENTITY_LIST_PATH = GRAPH_DATA_DIR / "entity_list.txt"
 TRAIT_CONCEPT_WEIGHTS_PATH = GRAPH_DATA_DIR / "trait_concept_weights.txt"
 ITEM_CONCEPT_WEIGHTS_PATH = GRAPH_DATA_DIR / "item_concept_weights.txt"
 
+# 상품 데이터
+PRODUCTS_CSV_PATH = DATA_DIR / "products" / "products.csv"
+
 # 심리테스트 관련
 SURVEY_QUESTIONS_PATH = DATA_DIR / "survey_questions.json"
 
@@ -36,7 +42,62 @@ MODEL_CONFIG = {
 RECOMMENDATION_CONFIG = {
     "top_k": 10,  # Top-K 추천 개수
     "similarity_threshold": 0.1,  # 유사도 임계값
-    "user_id_start": 2000  # User 노드 ID 시작 번호
+    "user_id_start": 2000,  # User 노드 ID 시작 번호
+    "user_embedding_max_entries": 10000,  # User 임베딩 저장소 최대 항목 수
+    "user_embedding_ttl_seconds": 3600,  # User 임베딩 유지 시간 (초)
+    "description_preview_length": 200,  # expand=product 응답의 상품 설명 길이
+    "diversity_candidate_pool": 200,  # 다양성 재정렬 전 후보 개수
+    "diversity_lambda": 0.7,  # MMR 관련도 비중 (1.0이면 유사도 순 그대로)
+    "batch_max_sessions": 100,  # 일괄 추천 요청 1회당 최대 세션 수
+    "batch_max_top_k": 50,  # 일괄 추천 세션별 최대 추천 개수
+    "noise_mode": os.getenv("RECOMMENDATION_NOISE_MODE", "session"),  # session: 세션별 고정 노이즈 | random: 호출마다 다른 노이즈
+    "noise_seed": int(os.getenv("RECOMMENDATION_NOISE_SEED", "0"))  # session 모드에서 세션 키와 함께 해시하는 기본 시드
+}
+
+# 아이템 검색 인덱스 설정 (python -m utils.engines.retrieval_index 로 recall/지연시간 비교)
+RETRIEVAL_CONFIG = {
+    "index": os.getenv("RETRIEVAL_INDEX", "exact"),  # exact | ivf | lsh
+    "ivf_n_lists": 0,  # IVF 클러스터 수 (0이면 √아이템 수)
+    "ivf_n_probe": 16,  # 검색 시 탐색할 클러스터 수
+    "ivf_iterations": 10,  # k-means 반복 횟수
+    "lsh_tables": 8,  # LSH 해시 테이블 수
+    "lsh_bits": 8,  # 테이블당 초평면 비트 수
+    "seed": 42
+}
+
+# GPT 호출 설정
+GPT_CONFIG = {
+    "model": "gpt-3.5-turbo",
+    "timeout": 20.0,  # 요청당 최대 대기 시간 (초)
+    "max_retries": 2,
+    "max_concurrency": 16  # 동시에 진행할 수 있는 GPT 요청 수
+}
+
+# GPT 응답 캐시 설정 (backend: memory | sqlite | none)
+GPT_CACHE_CONFIG = {
+    "backend": os.getenv("GPT_CACHE_BACKEND", "memory"),
+    "max_entries": 5000,
+    "ttl_seconds": 86400,
+    "sqlite_path": PROJECT_ROOT / "cache" / "gpt_cache.sqlite3"
+}
+
+# 세션 저장소 설정 (backend: memory | sqlite, sqlite는 여러 워커 프로세스가 공유)
+SESSION_CONFIG = {
+    "backend": os.getenv("SESSION_BACKEND", "memory"),
+    "max_entries": 100000,
+    "ttl_seconds": 21600,  # 마지막 접근 후 세션 유지 시간 (초)
+    "sweep_interval_seconds": 60,  # 만료 세션 정리 주기 (초)
+    "sqlite_path": PROJECT_ROOT / "cache" / "sessions.sqlite3"
+}
+
+# API 응답 캐시 설정
+API_CACHE_CONFIG = {
+    "questions_max_age": 300  # 질문 목록 Cache-Control max-age (초)
+}
+
+# 상품 조회 설정
+PRODUCT_CONFIG = {
+    "batch_max_ids": 100  # 상품 일괄 조회 요청 1회당 최대 ID 수
 }
 
 # 심리테스트 척도 매핑
@@ -50,9 +111,11 @@ PSYCHOLOGY_TRAITS = {
 
 # 로깅 설정
 LOGGING_CONFIG = {
-    "level": "INFO",
+    "level": os.getenv("LOG_LEVEL", "INFO"),  # 요청별 상세 로그는 DEBUG
     "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    "log_file": PROJECT_ROOT / "logs" / "recommendation.log"
+    "log_file": PROJECT_ROOT / "logs" / "recommendation.log",
+    "max_bytes": 10 * 1024 * 1024,  # 로그 파일 최대 크기 (초과 시 교체)
+    "backup_count": 5
 }
 
 def ensure_directories():
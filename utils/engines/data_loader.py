@@ -4,6 +4,10 @@
 import pandas as pd
 import os
 from pathlib import Path
+from utils.logger import get_logger
+from utils.metrics import stage_timer
+
+logger = get_logger(__name__)
 
 class PsychologyDataLoader:
     def __init__(self):
@@ -28,9 +32,10 @@ class PsychologyDataLoader:
         # 전체 질문 리스트 (순서대로)
         self.all_questions = []
         
+    @stage_timer("load", "question_csv")
     def load_all_data(self):
         """모든 CSV 파일 로드"""
-        print("📂 심리테스트 데이터 로딩 중...")
+        logger.info("심리테스트 데이터 로딩 중...")
         
         # 메인 질문 파일 (trait만)
         self.trait_questions = pd.read_csv(self.trait_questions_path)
@@ -41,9 +46,36 @@ class PsychologyDataLoader:
         self.choice_5_data = pd.read_csv(self.choice_5_path)
         self.choice_ox_data = pd.read_csv(self.choice_ox_path)
         
-        print(f"✅ 데이터 로딩 완료!")
-        print(f"   - Trait 질문: {len(self.trait_questions)}개")
+        # 질문 문구 → 선택지 목록 (중복 질문은 첫 행 기준)
+        self.choice_2_index = self._build_choice_index(self.choice_2_data, 2)
+        self.choice_4_index = self._build_choice_index(self.choice_4_data, 4)
+        
+        logger.info("데이터 로딩 완료: Trait 질문 %d개", len(self.trait_questions))
         
+    @staticmethod
+    def _build_choice_index(df, num_choices):
+        """질문 문구별 선택지 목록 인덱스 생성"""
+        columns = ['question'] + [f'response_{i}' for i in range(1, num_choices + 1)]
+        index = {}
+        for row in df[columns].itertuples(index=False):
+            index.setdefault(row[0], list(row[1:]))
+        return index
+    
+    def source_paths(self):
+        """질문 구조 생성에 사용하는 CSV 파일 경로들"""
+        return [
+            self.trait_questions_path,
+            self.choice_2_path,
+            self.choice_4_path,
+            self.choice_5_path,
+            self.choice_ox_path
+        ]
+    
+    def source_mtimes(self):
+        """CSV 파일 수정 시각 (변경 감지용)"""
+        return tuple(path.stat().st_mtime_ns for path in self.source_paths())
+    
+    @stage_timer("load", "question_structure")
     def create_question_structure(self):
         """질문을 구조화된 형태로 변환"""
         if self.trait_questions is None:
@@ -52,20 +84,21 @@ class PsychologyDataLoader:
         self.all_questions = []
         
         # 1. Trait 질문들 먼저 추가
-        for idx, row in self.trait_questions.iterrows():
+        trait_rows = self.trait_questions[['question_type', 'question', 'trait_node']].itertuples()
+        for idx, question_type, question, trait_node in trait_rows:
             question_data = {
                 'id': f"trait_{idx}",
                 'category': 'trait',
-                'question_type': row['question_type'],
-                'question': row['question'],
-                'target_node': row['trait_node'],
-                'choices': self._get_choices_for_question(row['question_type'], row['question'])
+                'question_type': question_type,
+                'question': question,
+                'target_node': trait_node,
+                'choices': self._get_choices_for_question(question_type, question)
             }
             self.all_questions.append(question_data)
         
         # Concept 질문은 사용하지 않음
             
-        print(f"📋 총 {len(self.all_questions)}개 질문 구조화 완료")
+        logger.info("총 %d개 질문 구조화 완료", len(self.all_questions))
         return self.all_questions
     
     def _get_choices_for_question(self, question_type, question_text):
@@ -75,18 +108,16 @@ class PsychologyDataLoader:
         
         elif question_type == "2_choice_question":
             # 2-choice-question.csv에서 해당 질문 찾기
-            match_row = self.choice_2_data[self.choice_2_data['question'] == question_text]
-            if not match_row.empty:
-                row = match_row.iloc[0]
-                return [row['response_1'], row['response_2']]
+            choices = self.choice_2_index.get(question_text)
+            if choices is not None:
+                return list(choices)
             return ["선택지 1", "선택지 2"]
         
         elif question_type == "4_choice_question":
             # 4-choice-question.csv에서 해당 질문 찾기
-            match_row = self.choice_4_data[self.choice_4_data['question'] == question_text]
-            if not match_row.empty:
-                row = match_row.iloc[0]
-                return [row['response_1'], row['response_2'], row['response_3'], row['response_4']]
+            choices = self.choice_4_index.get(question_text)
+            if choices is not None:
+                return list(choices)
             return ["선택지 1", "선택지 2", "선택지 3", "선택지 4"]
         
         elif question_type == "O_X_question":
@@ -0,0 +1,39 @@
+"""
+다양성 재정렬 - 후보 임베딩 Gram 행렬 기반 MMR(Maximal Marginal Relevance)
+"""
+import numpy as np
+
+def mmr_rerank(relevance, vectors, top_k, diversity_lambda=0.7):
+    """
+    관련도와 이미 선택된 아이템과의 최대 유사도를 절충하여 top_k개 인덱스를 선택 순서대로 반환
+
+    score = λ · relevance - (1 - λ) · max_sim(selected)
+    vectors는 L2 정규화된 후보 임베딩 (임베딩이 없는 후보는 0 벡터 → 유사도 0)
+    """
+    relevance = np.asarray(relevance, dtype=np.float64)
+    n_candidates = len(relevance)
+    top_k = min(top_k, n_candidates)
+    if top_k <= 0:
+        return np.array([], dtype=np.int64)
+
+    vectors = np.asarray(vectors, dtype=np.float32)
+    gram = vectors @ vectors.T  # 후보 간 코사인 유사도 (한 번만 계산)
+
+    selected = np.empty(top_k, dtype=np.int64)
+    max_similarity = np.full(n_candidates, -np.inf)
+    available = np.ones(n_candidates, dtype=bool)
+
+    # 첫 번째는 관련도가 가장 높은 후보
+    current = int(np.argmax(relevance))
+    for step in range(top_k):
+        selected[step] = current
+        available[current] = False
+        if step + 1 == top_k:
+            break
+        # 선택된 아이템과의 최대 유사도를 후보 전체에 대해 한 번에 갱신
+        np.maximum(max_similarity, gram[current], out=max_similarity)
+        scores = diversity_lambda * relevance - (1.0 - diversity_lambda) * max_similarity
+        scores[~available] = -np.inf
+        current = int(np.argmax(scores))
+
+    return selected
@@ -0,0 +1,105 @@
+"""
+고속 로딩용 모델 포맷 - float32 .npy 임베딩 행렬 + ID 배열 + 메타데이터 헤더
+
+pickle(NetworkX 그래프 + 노드별 numpy 배열) 대신 memory-map 가능한 배열로 저장하여
+콜드 스타트 시간을 줄이고, 여러 uvicorn 워커가 같은 페이지를 공유하도록 한다.
+"""
+import json
+import time
+from pathlib import Path
+from types import MappingProxyType
+import numpy as np
+
+FORMAT_VERSION = 1
+META_FILE = "meta.json"
+EMBEDDINGS_FILE = "embeddings.npy"
+NODE_IDS_FILE = "node_ids.npy"
+ITEM_MATRIX_FILE = "item_matrix.npy"
+ITEM_IDS_FILE = "item_ids.npy"
+
+def save_compact_model(model, output_dir):
+    """로드된 모델 dict를 compact 포맷으로 저장 (meta.json을 마지막에 기록)"""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    node_ids = np.array(sorted(model['node_embeddings']), dtype=np.int64)
+    embeddings = np.vstack([model['node_embeddings'][node_id] for node_id in node_ids]).astype(np.float32)
+
+    np.save(output_dir / EMBEDDINGS_FILE, np.ascontiguousarray(embeddings))
+    np.save(output_dir / NODE_IDS_FILE, node_ids)
+    np.save(output_dir / ITEM_MATRIX_FILE, np.ascontiguousarray(model['item_matrix'], dtype=np.float32))
+    np.save(output_dir / ITEM_IDS_FILE, np.asarray(model['item_ids'], dtype=np.int64))
+
+    meta = {
+        "format_version": FORMAT_VERSION,
+        "exported_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "embedding_dim": int(model['embedding_dim']),
+        "num_nodes": int(len(node_ids)),
+        "num_items": int(len(model['item_ids'])),
+        "node_types": {
+            node_type: [int(node_id) for node_id in ids]
+            for node_type, ids in model['node_types'].items()
+        },
+        "node_id_mapping": {
+            str(name): {"id": int(data['id']), "type": data.get('type')}
+            for name, data in model['node_id_mapping'].items()
+        },
+        "item_names": list(model['item_names'])
+    }
+    with open(output_dir / META_FILE, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, separators=(',', ':'))
+
+    return meta
+
+def has_compact_model(model_dir):
+    """compact 포맷 존재 여부 (meta.json 기준)"""
+    return model_dir is not None and (Path(model_dir) / META_FILE).exists()
+
+def load_compact_model(model_dir, mmap_mode='r'):
+    """compact 포맷을 memory-map으로 로드하여 엔진용 모델 dict 반환"""
+    model_dir = Path(model_dir)
+    with open(model_dir / META_FILE, 'r', encoding='utf-8') as f:
+        meta = json.load(f)
+
+    if meta.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"지원하지 않는 모델 포맷 버전: {meta.get('format_version')}")
+
+    embeddings = np.load(model_dir / EMBEDDINGS_FILE, mmap_mode=mmap_mode)
+    node_ids = np.load(model_dir / NODE_IDS_FILE)
+    item_matrix = np.load(model_dir / ITEM_MATRIX_FILE, mmap_mode=mmap_mode)
+    item_ids = np.load(model_dir / ITEM_IDS_FILE)
+
+    if embeddings.shape != (meta["num_nodes"], meta["embedding_dim"]):
+        raise ValueError(f"임베딩 행렬 크기 불일치: {embeddings.shape}")
+    if item_matrix.shape != (meta["num_items"], meta["embedding_dim"]):
+        raise ValueError(f"아이템 행렬 크기 불일치: {item_matrix.shape}")
+
+    # 노드별 임베딩은 memory-map 행렬의 행 view (복사 없음)
+    node_embeddings = {int(node_id): embeddings[row] for row, node_id in enumerate(node_ids)}
+
+    return {
+        'graph': None,
+        'node_types': meta["node_types"],
+        'node_id_mapping': meta["node_id_mapping"],
+        'node_embeddings': MappingProxyType(node_embeddings),
+        'embedding_dim': meta["embedding_dim"],
+        'item_ids': item_ids,
+        'item_names': meta["item_names"],
+        'item_matrix': item_matrix
+    }
+
+# pickle 모델 → compact 포맷 변환 도구
+if __name__ == "__main__":
+    import argparse
+    from utils.config import COMPACT_MODEL_DIR
+    from utils.engines.recommendation_engine import RecommendationEngine
+
+    parser = argparse.ArgumentParser(description="pickle 모델을 compact(.npy) 포맷으로 변환")
+    parser.add_argument("--output", default=str(COMPACT_MODEL_DIR), help="출력 디렉토리")
+    args = parser.parse_args()
+
+    engine = RecommendationEngine()
+    engine.compact_model_dir = None  # 항상 원본 pickle에서 변환
+    engine.load_model()
+    meta = save_compact_model(engine.model, args.output)
+    print(f"compact 모델 저장 완료: {args.output} ({meta['num_nodes']}개 노드, {meta['num_items']}개 아이템)")
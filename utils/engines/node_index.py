@@ -0,0 +1,83 @@
+"""
+노드 인덱스 - 노드 이름 ↔ 그래프 노드 ID ↔ 실제 상품 ID 양방향 조회
+"""
+from pathlib import Path
+
+class NodeIndex:
+    def __init__(self):
+        self.name_to_id = {}
+        self.id_to_name = {}
+        self.id_to_type = {}
+        self.node_to_product = {}
+        self.product_to_node = {}
+        # 출처별 원본 매핑 (일관성 검사용)
+        self.model_entries = {}
+        self.entity_entries = {}
+
+    @classmethod
+    def build(cls, node_id_mapping, entity_list_path=None):
+        """pickle의 node_id_mapping과 entity_list.txt를 합쳐 인덱스 생성"""
+        index = cls()
+
+        for name, data in node_id_mapping.items():
+            index.model_entries[str(name)] = (data['id'], data.get('type'))
+
+        if entity_list_path is not None and Path(entity_list_path).exists():
+            with open(entity_list_path, 'r') as f:
+                for line in f:
+                    parts = line.strip().split()
+                    if len(parts) >= 3:
+                        index.entity_entries[parts[0]] = (int(parts[1]), parts[2])
+
+        # entity_list.txt를 먼저 반영하고 모델 매핑으로 덮어씀 (모델 기준)
+        for entries in (index.entity_entries, index.model_entries):
+            for name, (node_id, node_type) in entries.items():
+                index._add(name, node_id, node_type)
+
+        return index
+
+    def _add(self, name, node_id, node_type):
+        self.name_to_id[name] = node_id
+        self.id_to_name[node_id] = name
+        self.id_to_type[node_id] = node_type
+        if node_type == 'item':
+            try:
+                product_id = int(name)
+            except ValueError:
+                return
+            self.node_to_product[node_id] = product_id
+            self.product_to_node[product_id] = node_id
+
+    def node_id(self, name):
+        """노드 이름 → 그래프 노드 ID"""
+        return self.name_to_id.get(name)
+
+    def name(self, node_id):
+        """그래프 노드 ID → 노드 이름"""
+        return self.id_to_name.get(node_id)
+
+    def product_id(self, node_id):
+        """그래프 노드 ID → 실제 상품 ID"""
+        return self.node_to_product.get(node_id)
+
+    def node_id_by_product(self, product_id):
+        """실제 상품 ID → 그래프 노드 ID"""
+        return self.product_to_node.get(product_id)
+
+    def check_consistency(self):
+        """모델 매핑과 entity_list.txt 사이의 누락/불일치 노드 보고"""
+        model_names = set(self.model_entries)
+        entity_names = set(self.entity_entries)
+        mismatched = sorted(
+            name for name in model_names & entity_names
+            if self.model_entries[name] != self.entity_entries[name]
+        )
+        return {
+            "missing_in_entity_list": sorted(model_names - entity_names),
+            "missing_in_model": sorted(entity_names - model_names),
+            "mismatched": mismatched,
+            "consistent": model_names == entity_names and not mismatched
+        }
+
+    def __len__(self):
+        return len(self.name_to_id)
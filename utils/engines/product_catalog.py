@@ -0,0 +1,80 @@
+"""
+상품 카탈로그 - products.csv를 상품 ID 해시 인덱스로 로드 (NaN 정리 및 JSON 직렬화 미리 수행)
+"""
+import json
+import pandas as pd
+from pathlib import Path
+from utils.config import PRODUCTS_CSV_PATH, RECOMMENDATION_CONFIG
+from utils.metrics import stage_timer
+
+class ProductCatalog:
+    def __init__(self, products_path=PRODUCTS_CSV_PATH,
+                 description_preview_length=RECOMMENDATION_CONFIG["description_preview_length"]):
+        self.products_path = Path(products_path)
+        self.description_preview_length = description_preview_length
+        # product_id → 상품 레코드 dict (NaN은 None으로 변환됨, 읽기 전용으로 사용)
+        self.records = {}
+        # product_id → 상품 레코드 JSON 바이트
+        self.records_json = {}
+        # product_id → 추천 결과에 붙일 요약 정보 (이름, 가격, 대표 이미지, 설명 일부)
+        self.summaries = {}
+
+    @stage_timer("load", "product_csv")
+    def load(self):
+        """CSV를 읽어 상품 ID 인덱스 구성"""
+        products_df = pd.read_csv(self.products_path)
+        cleaned_df = products_df.astype(object).where(products_df.notna(), None)
+
+        records = {}
+        records_json = {}
+        summaries = {}
+        for record in cleaned_df.to_dict('records'):
+            product_id = int(record['product_id'])
+            if product_id in records:
+                continue  # 중복 ID는 첫 행 기준
+            records[product_id] = record
+            records_json[product_id] = json.dumps(
+                record, ensure_ascii=False, allow_nan=False, separators=(',', ':')
+            ).encode('utf-8')
+            summaries[product_id] = self._summarize(record)
+
+        self.records = records
+        self.records_json = records_json
+        self.summaries = summaries
+        return self
+
+    def _summarize(self, record):
+        """추천 응답용 상품 요약 (설명은 미리보기 길이로 자름)"""
+        description = record.get('description')
+        if description is not None and len(description) > self.description_preview_length:
+            description = description[:self.description_preview_length] + '...'
+        return {
+            'name': record.get('name'),
+            'price': record.get('price'),
+            'image_path': record.get('image_path'),
+            'description': description
+        }
+
+    def get(self, product_id):
+        """상품 ID로 레코드 조회 (없으면 None)"""
+        return self.records.get(product_id)
+
+    def get_json(self, product_id):
+        """상품 ID로 직렬화된 레코드 조회 (없으면 None)"""
+        return self.records_json.get(product_id)
+
+    def get_many(self, product_ids):
+        """여러 상품 ID를 한 번에 조회 (id → 레코드, 없는 ID는 제외)"""
+        records = self.records
+        return {product_id: records[product_id] for product_id in product_ids if product_id in records}
+
+    def get_summaries(self, product_ids):
+        """여러 상품의 요약 정보를 한 번에 조회 (id → 요약, 없는 ID는 제외)"""
+        summaries = self.summaries
+        return {product_id: summaries[product_id] for product_id in product_ids if product_id in summaries}
+
+    def __contains__(self, product_id):
+        return product_id in self.records
+
+    def __len__(self):
+        return len(self.records)
@@ -1,77 +1,215 @@
 """
 추천 엔진 - 그래프에 User 노드 추가 및 추천 생성
 """
+import hashlib
+import logging
 import pickle
+import threading
+from types import MappingProxyType
 import numpy as np
-import pandas as pd
-from pathlib import Path
-from sklearn.metrics.pairwise import cosine_similarity
+from utils.config import (
+    RECOMMENDATION_CONFIG, RETRIEVAL_CONFIG, ENTITY_LIST_PATH, EMBEDDINGS_PKL_PATH, GRAPH_PKL_PATH, COMPACT_MODEL_DIR
+)
+from utils.engines.model_store import has_compact_model, load_compact_model
+from utils.engines.node_index import NodeIndex
+from utils.engines.retrieval_index import build_retrieval_index
+from utils.engines.user_store import UserEmbeddingStore
+from utils.logger import get_logger
+from utils.metrics import stage_timer
+
+logger = get_logger(__name__)
 
 class RecommendationEngine:
-    def __init__(self):
+    """추천 엔진 (여러 스레드에서 동시 호출 가능)
+
+    로드 후 읽기 전용으로 고정되는 모델 상태(model, retrieval_index, node_index)와
+    요청마다 바뀌는 상태(user_store, user_id_counter)를 분리하고, 후자는 lock으로 보호한다.
+    """
+    def __init__(self, user_store=None):
         self.model = None
-        # 백엔드 구조에 맞게 경로 수정
-        base_path = Path(__file__).parent.parent
-        self.embeddings_path = base_path / "models" / "embeddings.pkl"
-        self.graph_path = base_path / "models" / "recommendation_graph.pkl"
-        self.user_id_counter = 2000
+        self._loaded = False
+        self._load_lock = threading.RLock()
+        # 요청별 User 임베딩은 공유 모델과 분리된 제한 저장소에 보관
+        if user_store is None:
+            user_store = UserEmbeddingStore(
+                max_entries=RECOMMENDATION_CONFIG["user_embedding_max_entries"],
+                ttl_seconds=RECOMMENDATION_CONFIG["user_embedding_ttl_seconds"]
+            )
+        self.user_store = user_store
+        self.embeddings_path = EMBEDDINGS_PKL_PATH
+        self.graph_path = GRAPH_PKL_PATH
+        self.compact_model_dir = COMPACT_MODEL_DIR
+        self.entity_list_path = ENTITY_LIST_PATH
+        self.node_index = None
+        self.retrieval_index = None
+        self.user_id_counter = RECOMMENDATION_CONFIG["user_id_start"]
+        self._counter_lock = threading.Lock()
         
+    @stage_timer("load", "model")
     def load_model(self):
-        """학습된 모델과 그래프 로드"""
-        print("모델 로딩 중...")
+        """학습된 모델 로드 후 읽기 전용으로 고정 (동시에 호출되어도 한 번에 하나씩 로드)"""
+        with self._load_lock:
+            self._load()
+            self._freeze_model()
+            self._loaded = True
+    
+    def ensure_loaded(self):
+        """모델이 아직 없으면 로드 (여러 스레드가 동시에 호출해도 한 번만 로드)"""
+        if not self._loaded:
+            with self._load_lock:
+                if not self._loaded:
+                    self.load_model()
+    
+    def _load(self):
+        """compact 포맷 우선, 없으면 pickle 모델 로드 후 검색용 인덱스 구성"""
+        logger.info("모델 로딩 중...")
+        
+        if has_compact_model(self.compact_model_dir):
+            try:
+                self.model = load_compact_model(self.compact_model_dir)
+                self._build_item_rows()
+                self._build_retrieval_index()
+                self._build_node_index()
+                logger.info("compact 모델 로드 완료: %d개 노드 임베딩", len(self.model['node_embeddings']))
+                return
+            except Exception as e:
+                logger.warning("compact 모델 로드 실패, pickle 모델로 대체: %s", e)
         
         try:
-            # 임베딩 로드
-            with open(self.embeddings_path, 'rb') as f:
-                embedding_data = pickle.load(f)
-            
-            # 그래프 로드
-            with open(self.graph_path, 'rb') as f:
-                graph_data = pickle.load(f)
+            self.model = self._load_pickled_model()
+            self._build_item_matrix()
+            # 그래프는 아이템 이름 조회에만 사용하므로 행렬 구성 후 해제
+            self.model['graph'] = None
+            self._build_item_rows()
+            self._build_retrieval_index()
+            self._build_node_index()
             
-            self.model = {
-                'graph': graph_data['graph'],
-                'node_types': graph_data.get('node_types', {}),
-                'node_id_mapping': graph_data.get('node_id_mapping', {}),
-                'node_embeddings': embedding_data.get('embeddings', {}),
-                'embedding_dim': len(list(embedding_data.get('embeddings', {}).values())[0]) if embedding_data.get('embeddings') else 128
-            }
-            
-            print(f"모델 로드 완료: {len(self.model['node_embeddings'])}개 노드 임베딩")
+            logger.info("모델 로드 완료: %d개 노드 임베딩", len(self.model['node_embeddings']))
             
-        except Exception as e:
-            print(f"모델 로드 실패: {e}")
-            raise e
+        except Exception:
+            logger.exception("모델 로드 실패")
+            raise
+    
+    def _load_pickled_model(self):
+        """pickle 임베딩과 NetworkX 그래프 로드"""
+        # 임베딩 로드
+        with open(self.embeddings_path, 'rb') as f:
+            embedding_data = pickle.load(f)
+        
+        # 그래프 로드
+        with open(self.graph_path, 'rb') as f:
+            graph_data = pickle.load(f)
+        
+        # Item/Trait 임베딩을 하나의 연속 행렬로 모으고 읽기 전용 행 view로 제공
+        # (fork된 워커들이 같은 페이지를 copy-on-write로 공유)
+        node_embeddings = embedding_data.get('embeddings', {})
+        if node_embeddings:
+            node_ids = list(node_embeddings)
+            matrix = np.vstack([node_embeddings[node_id] for node_id in node_ids])
+            matrix.setflags(write=False)
+            node_embeddings = {node_id: matrix[row] for row, node_id in enumerate(node_ids)}
+        
+        return {
+            'graph': graph_data['graph'],
+            'node_types': graph_data.get('node_types', {}),
+            'node_id_mapping': graph_data.get('node_id_mapping', {}),
+            'node_embeddings': MappingProxyType(node_embeddings),
+            'embedding_dim': len(list(node_embeddings.values())[0]) if node_embeddings else 128
+        }
         
-    def add_user_node(self, user_weights):
-        """User 노드를 그래프에 추가하고 임베딩 생성"""
-        if self.model is None:
-            self.load_model()
+    def _build_item_matrix(self):
+        """아이템 임베딩을 L2 정규화된 연속 행렬로 미리 구성"""
+        embeddings = self.model['node_embeddings']
+        graph = self.model['graph']
+        item_ids = [item_id for item_id in self.model['node_types'].get('item', []) if item_id in embeddings]
         
-        user_id = self.user_id_counter
-        self.user_id_counter += 1
+        if item_ids:
+            matrix = np.vstack([embeddings[item_id] for item_id in item_ids]).astype(np.float32)
+        else:
+            matrix = np.zeros((0, self.model['embedding_dim']), dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        
+        self.model['item_ids'] = np.array(item_ids, dtype=np.int64)
+        self.model['item_names'] = [graph.nodes[item_id].get('name', f'item_{item_id}') for item_id in item_ids]
+        self.model['item_matrix'] = np.ascontiguousarray(matrix / norms)
+    
+    def _build_item_rows(self):
+        """아이템 노드 ID → 아이템 행렬 행 번호"""
+        self.model['item_rows'] = {int(item_id): row for row, item_id in enumerate(self.model['item_ids'])}
+    
+    def _build_retrieval_index(self):
+        """아이템 행렬 위에 설정된 검색 인덱스 구성"""
+        self.retrieval_index = build_retrieval_index(self.model['item_matrix'], RETRIEVAL_CONFIG)
+        logger.info("검색 인덱스 구성 완료: %s", self.retrieval_index.stats())
+    
+    def get_item_vectors(self, item_ids):
+        """아이템 노드 ID 목록의 정규화 임베딩 행렬 (행렬에 없는 아이템은 0 벡터)"""
+        item_rows = self.model['item_rows']
+        rows = np.array([item_rows.get(item_id, -1) for item_id in item_ids], dtype=np.int64)
+        vectors = np.zeros((len(rows), self.model['embedding_dim']), dtype=np.float32)
+        found = rows >= 0
+        vectors[found] = self.model['item_matrix'][rows[found]]
+        return vectors
+    
+    def _freeze_model(self):
+        """로드된 모델을 읽기 전용으로 고정 (요청 처리 중에는 user_store에만 기록)"""
+        for key in ('item_ids', 'item_matrix'):
+            if self.model[key].flags.writeable:
+                self.model[key].setflags(write=False)
+        self.model['item_names'] = tuple(self.model['item_names'])
+        self.model = MappingProxyType(self.model)
+    
+    def _build_node_index(self):
+        """노드 이름/ID/상품 ID 인덱스 구성 및 일관성 검사"""
+        self.node_index = NodeIndex.build(self.model['node_id_mapping'], self.entity_list_path)
+        report = self.node_index.check_consistency()
+        if not report['consistent']:
+            logger.warning(
+                "노드 매핑 불일치: entity_list 누락 %d개, 모델 누락 %d개, ID 불일치 %d개",
+                len(report['missing_in_entity_list']), len(report['missing_in_model']), len(report['mismatched'])
+            )
+        return report
+    
+    def add_user_node(self, user_weights, user_key=None):
+        """User 임베딩 생성 후 User 저장소에 등록 (user_key가 없으면 새 ID 발급)"""
+        self.ensure_loaded()
+        
+        if user_key is None:
+            user_id = self._next_user_id()
+        else:
+            user_id = user_key
         
         # 그래프에 User 노드 추가 (임시로 추가하지 않고 임베딩만 생성)
+        user_edges = self._get_user_edges(user_weights)
+        
+        # User 임베딩 생성 (연결된 노드들의 가중평균)
+        user_embedding = self._generate_user_embedding(user_edges, self._noise_rng(user_id, "embedding"))
+        self.user_store.put(user_id, user_embedding)
+        
+        logger.debug("User 노드 추가 완료: 연결된 노드 %d개", len(user_edges))
+        return user_id
+    
+    def _next_user_id(self):
+        """새 User ID 발급 (스레드 간 중복 방지)"""
+        with self._counter_lock:
+            user_id = self.user_id_counter
+            self.user_id_counter += 1
+        return user_id
+    
+    def _get_user_edges(self, user_weights):
+        """User 가중치를 (노드 ID, 가중치) 엣지 목록으로 변환"""
         user_edges = []
         for node_name, weight in user_weights.items():
             # 노드 이름을 ID로 변환
             node_id = self._get_node_id_by_name(node_name)
             if node_id and node_id in self.model['node_embeddings']:
                 user_edges.append((node_id, weight))
-        
-        # User 임베딩 생성 (연결된 노드들의 가중평균)
-        user_embedding = self._generate_user_embedding(user_edges)
-        self.model['node_embeddings'][user_id] = user_embedding
-        
-        print(f"User 노드 추가 완료: {user_id}, 연결된 노드: {len(user_edges)}개")
-        return user_id
+        return user_edges
     
     def _get_node_id_by_name(self, node_name):
         """노드 이름으로 ID 찾기"""
-        for name, data in self.model['node_id_mapping'].items():
-            if name == node_name:
-                return data['id']
-        return None
+        return self.node_index.node_id(node_name)
     
     def _is_trait_node(self, node_name):
         """Trait 노드인지 확인"""
@@ -80,10 +218,21 @@ class RecommendationEngine:
                       'OSL', 'CNFU', 'MVS', 'CVPA']
         return node_name in trait_nodes
     
-    def _generate_user_embedding(self, user_edges):
+    @staticmethod
+    def _noise_rng(seed_key, stream):
+        """노이즈용 난수 생성기 (session 모드면 seed_key와 stream 해시로 고정, 아니면 매번 새 시드)"""
+        if seed_key is None or RECOMMENDATION_CONFIG["noise_mode"] != "session":
+            return np.random.default_rng()
+        # 프로세스/워커가 달라도 같은 값이 나오도록 hash() 대신 blake2b 사용
+        digest = hashlib.blake2b(
+            f"{RECOMMENDATION_CONFIG['noise_seed']}:{stream}:{seed_key}".encode("utf-8"), digest_size=8
+        ).digest()
+        return np.random.default_rng(int.from_bytes(digest, "little"))
+    
+    def _generate_user_embedding(self, user_edges, rng):
         """User 임베딩 생성 (가중치 차이를 극대화한 가중평균)"""
         if not user_edges:
-            return np.random.normal(0, 0.1, self.model['embedding_dim'])
+            return rng.normal(0, 0.1, self.model['embedding_dim'])
         
         user_embedding = np.zeros(self.model['embedding_dim'])
         total_weight = 0
@@ -102,104 +251,96 @@ class RecommendationEngine:
         if total_weight > 0:
             user_embedding /= total_weight
         else:
-            user_embedding = np.random.normal(0, 0.1, self.model['embedding_dim'])
+            user_embedding = rng.normal(0, 0.1, self.model['embedding_dim'])
         
         # 임베딩에 노이즈 추가로 다양성 증대
         noise_factor = 0.1
-        noise = np.random.normal(0, noise_factor, self.model['embedding_dim'])
+        noise = rng.normal(0, noise_factor, self.model['embedding_dim'])
         user_embedding += noise
         
         return user_embedding
     
     def get_recommendations(self, user_id, top_k=10):
-        """User에게 아이템 추천"""
-        if user_id not in self.model['node_embeddings']:
+        """User에게 아이템 추천 (session 모드에서는 같은 user_id면 같은 결과)"""
+        user_embedding = self.user_store.get(user_id)
+        if user_embedding is None:
             raise ValueError(f"User {user_id}의 임베딩이 없습니다.")
         
-        user_embedding = self.model['node_embeddings'][user_id]
-        
-        # 아이템 노드들과 유사도 계산
-        item_similarities = []
-        for item_id in self.model['node_types'].get('item', []):
-            if item_id in self.model['node_embeddings']:
-                item_embedding = self.model['node_embeddings'][item_id]
-                similarity = cosine_similarity(
-                    user_embedding.reshape(1, -1),
-                    item_embedding.reshape(1, -1)
-                )[0][0]
-                
-                item_data = self.model['graph'].nodes[item_id]
-                item_similarities.append({
-                    'item_id': item_id,
-                    'item_name': item_data.get('name', f'item_{item_id}'),
-                    'similarity': similarity
-                })
-        
-        # 유사도에 작은 랜덤 노이즈 추가로 동일 결과 방지
-        import random
-        for item in item_similarities:
-            noise = random.uniform(-0.01, 0.01)  # 작은 노이즈 추가
-            item['similarity'] += noise
-        
-        # 유사도 기준 정렬
-        item_similarities.sort(key=lambda x: x['similarity'], reverse=True)
-        
-        print(f"추천 생성 완료: 상위 {top_k}개 선택 (총 {len(item_similarities)}개 중)")
-        if item_similarities:
-            print(f"최고 유사도: {item_similarities[0]['similarity']:.4f}, 최저 유사도: {item_similarities[-1]['similarity']:.4f}")
-        
-        return item_similarities[:top_k]
-    
-    def get_item_details(self, recommendations):
-        """추천 아이템의 상세 정보 추가"""
-        try:
-            # products.csv에서 상품 정보 로드
-            products_csv_path = Path("data/product/products.csv")
-            if products_csv_path.exists():
-                products_df = pd.read_csv(products_csv_path)
-                
-                for rec in recommendations:
-                    node_id = rec['item_id']  # 이것은 노드 ID (1000번대)
-                    
-                    # 노드 ID → 상품 ID 매핑
-                    product_id = self._get_product_id_by_node_id(node_id)
-                    
-                    if product_id:
-                        # 상품 ID → 상품 정보 매핑
-                        product_row = products_df[products_df['product_id'].astype(str) == str(product_id)]
-                        if not product_row.empty:
-                            row = product_row.iloc[0]
-                            rec['product_id'] = product_id
-                            rec['name'] = row.get('name', rec['item_name'])
-                            rec['price'] = f"{row.get('price', 0):,}원" if pd.notna(row.get('price')) else 'N/A'
-                            rec['category'] = row.get('category', 'N/A')
-                            rec['description'] = row.get('description', 'N/A')[:200] + '...' if pd.notna(row.get('description')) and len(str(row.get('description'))) > 200 else row.get('description', 'N/A')
-                            rec['image_path'] = f"data/product/{row.get('image_path', '')}" if pd.notna(row.get('image_path')) else None
-                        else:
-                            rec['product_id'] = product_id
-                            rec['name'] = f'상품 {product_id}'
-                            rec['price'] = 'N/A'
-                            rec['category'] = 'N/A'
-                            rec['description'] = 'N/A'
-                            rec['image_path'] = None
-                    else:
-                        rec['product_id'] = None
-                        rec['name'] = f'노드 {node_id}'
-                        rec['price'] = 'N/A'
-                        rec['category'] = 'N/A'
-                        rec['description'] = 'N/A'
-                        rec['image_path'] = None
-        except Exception as e:
-            print(f"상품 정보 로드 실패: {e}")
-        
-        return recommendations
+        item_ids = self.model['item_ids']
+        
+        # 검색 인덱스로 후보 top_k개와 코사인 유사도 조회
+        top_indices, similarities = self.retrieval_index.search(self._normalize(user_embedding), top_k)
+        
+        # 유사도에 작은 랜덤 노이즈 추가로 동일 결과 방지 후 재정렬
+        rng = self._noise_rng(user_id, "ranking")
+        similarities = similarities + rng.uniform(-0.01, 0.01, len(similarities))
+        order = np.argsort(-similarities, kind='stable')
+        top_indices, similarities = top_indices[order], similarities[order]
+        
+        if len(similarities) and logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "추천 생성 완료: 상위 %d개 선택 (총 %d개 중), 최고 유사도 %.4f, 최저 유사도 %.4f",
+                top_k, len(item_ids), similarities.max(), similarities.min()
+            )
+        
+        return [
+            {
+                'item_id': int(item_ids[idx]),
+                'item_name': self.model['item_names'][idx],
+                'similarity': float(score)
+            }
+            for idx, score in zip(top_indices, similarities)
+        ]
+    
+    def get_batch_recommendations(self, user_weights_list, top_k=10, seed_keys=None):
+        """여러 User의 가중치를 한 번에 받아 행렬-행렬 곱으로 일괄 추천 (seed_keys: User별 노이즈 시드 키)"""
+        self.ensure_loaded()
+        
+        if not user_weights_list:
+            return []
+        if seed_keys is None:
+            seed_keys = [None] * len(user_weights_list)
+        
+        # N x D User 행렬 구성 (그래프/임베딩 저장소에는 추가하지 않음)
+        user_matrix = np.vstack([
+            self._generate_user_embedding(self._get_user_edges(user_weights), self._noise_rng(seed_key, "embedding"))
+            for user_weights, seed_key in zip(user_weights_list, seed_keys)
+        ]).astype(np.float32)
+        norms = np.linalg.norm(user_matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        user_matrix /= norms
+        
+        # 검색 인덱스로 User별 후보 조회 + 노이즈 후 재정렬
+        item_ids = self.model['item_ids']
+        item_names = self.model['item_names']
+        results = []
+        batch_results = self.retrieval_index.search_batch(user_matrix, top_k)
+        for (top_indices, similarities), seed_key in zip(batch_results, seed_keys):
+            rng = self._noise_rng(seed_key, "ranking")
+            similarities = similarities + rng.uniform(-0.01, 0.01, len(similarities))
+            order = np.argsort(-similarities, kind='stable')
+            results.append([
+                {
+                    'item_id': int(item_ids[idx]),
+                    'item_name': item_names[idx],
+                    'similarity': float(score)
+                }
+                for idx, score in zip(top_indices[order], similarities[order])
+            ])
+        
+        logger.debug("일괄 추천 생성 완료: %d명, 상위 %d개 (총 %d개 중)", len(user_weights_list), top_k, len(item_ids))
+        return results
+    
+    @staticmethod
+    def _normalize(user_embedding):
+        """User 임베딩을 float32 단위 벡터로 변환 (0 벡터는 그대로)"""
+        user_vector = np.asarray(user_embedding, dtype=np.float32)
+        norm = np.linalg.norm(user_vector)
+        return user_vector / norm if norm > 0 else user_vector
     
     def _get_product_id_by_node_id(self, node_id):
         """노드 ID로 실제 상품 ID 찾기"""
-        for product_id, data in self.model['node_id_mapping'].items():
-            if data.get('id') == node_id:
-                return product_id
-        return None
+        return self.node_index.product_id(node_id)
 
 # 테스트 코드
 if __name__ == "__main__":
@@ -215,7 +356,6 @@ if __name__ == "__main__":
     try:
         user_id = engine.add_user_node(test_weights)
         recommendations = engine.get_recommendations(user_id, top_k=5)
-        recommendations = engine.get_item_details(recommendations)
         
         print(f"\nUser {user_id} 추천 결과:")
         for i, rec in enumerate(recommendations, 1):
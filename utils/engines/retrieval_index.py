@@ -0,0 +1,242 @@
+"""
+아이템 검색 인덱스 - 정규화된 아이템 행렬에서 User 벡터와 코사인 유사도가 높은 상위 k개 검색
+
+- exact: 전체 행렬-벡터 곱 (정확, O(I·D))
+- ivf: 구면 k-means 클러스터 중 가까운 n_probe개만 탐색 (IVF-flat)
+- lsh: 랜덤 초평면 해시 버킷이 같은 아이템만 탐색 (random-projection LSH)
+"""
+import time
+from abc import ABC, abstractmethod
+import numpy as np
+
+def top_k_indices(scores, top_k):
+    """argpartition으로 상위 k개 인덱스를 점수 내림차순으로 반환"""
+    if top_k <= 0 or len(scores) == 0:
+        return np.array([], dtype=np.int64)
+    if top_k < len(scores):
+        candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.argsort(-scores[candidates], kind='stable')]
+
+class ExactIndex:
+    """전체 아이템 대상 brute-force 검색"""
+    name = "exact"
+
+    def __init__(self, item_matrix):
+        self.item_matrix = item_matrix
+
+    def search(self, query, top_k):
+        """정규화된 query에 대해 (아이템 행 번호, 유사도) 상위 k개 반환"""
+        scores = (self.item_matrix @ query).astype(np.float64)
+        indices = top_k_indices(scores, top_k)
+        return indices, scores[indices]
+
+    def search_batch(self, queries, top_k):
+        """N개 query를 행렬-행렬 곱 한 번으로 검색"""
+        scores = (queries @ self.item_matrix.T).astype(np.float64)
+        results = []
+        for row_scores in scores:
+            indices = top_k_indices(row_scores, top_k)
+            results.append((indices, row_scores[indices]))
+        return results
+
+    def stats(self):
+        return {"index": self.name, "items": int(len(self.item_matrix))}
+
+class _CandidateIndex(ExactIndex, ABC):
+    """후보 행만 골라 정확한 유사도로 재정렬하는 근사 인덱스 공통 부분 (_candidates는 하위 클래스에서 구현)"""
+
+    @abstractmethod
+    def _candidates(self, query):
+        """query와 가까울 가능성이 있는 아이템 행 번호 배열"""
+
+    def search(self, query, top_k):
+        candidates = self._candidates(query)
+        # 후보가 부족하면 정확 검색으로 대체 (재현율 보장)
+        if len(candidates) < top_k:
+            return super().search(query, top_k)
+        scores = (self.item_matrix[candidates] @ query).astype(np.float64)
+        order = top_k_indices(scores, top_k)
+        return candidates[order], scores[order]
+
+    def search_batch(self, queries, top_k):
+        return [self.search(query, top_k) for query in queries]
+
+class IVFFlatIndex(_CandidateIndex):
+    """구면 k-means로 아이템을 n_lists개 클러스터로 나누고 가까운 n_probe개 클러스터만 탐색"""
+    name = "ivf"
+
+    def __init__(self, item_matrix, n_lists=0, n_probe=8, iterations=10, seed=42):
+        super().__init__(item_matrix)
+        n_items = len(item_matrix)
+        # n_lists를 지정하지 않으면 √I개
+        if n_lists <= 0:
+            n_lists = int(np.sqrt(n_items))
+        self.n_lists = max(1, min(n_lists, n_items))
+        self.n_probe = max(1, min(n_probe, self.n_lists))
+        self.centroids, assignments = self._train(np.asarray(item_matrix), iterations, seed)
+        order = np.argsort(assignments, kind='stable')
+        bounds = np.searchsorted(assignments[order], np.arange(self.n_lists + 1))
+        self.lists = [order[bounds[i]:bounds[i + 1]] for i in range(self.n_lists)]
+
+    def _train(self, vectors, iterations, seed):
+        rng = np.random.default_rng(seed)
+        if len(vectors) == 0:
+            return np.zeros((self.n_lists, vectors.shape[1]), dtype=np.float32), np.array([], dtype=np.int64)
+
+        centroids = vectors[rng.choice(len(vectors), self.n_lists, replace=False)].astype(np.float32)
+        for _ in range(iterations):
+            assignments = np.argmax(vectors @ centroids.T, axis=1)
+            for list_id in range(self.n_lists):
+                members = vectors[assignments == list_id]
+                if len(members):
+                    centroid = members.sum(axis=0)
+                    norm = np.linalg.norm(centroid)
+                    if norm > 0:
+                        centroids[list_id] = centroid / norm
+        return centroids, np.argmax(vectors @ centroids.T, axis=1)
+
+    def _candidates(self, query):
+        probes = top_k_indices((self.centroids @ query).astype(np.float64), self.n_probe)
+        return np.concatenate([self.lists[list_id] for list_id in probes])
+
+    def stats(self):
+        sizes = [len(members) for members in self.lists]
+        return {
+            "index": self.name,
+            "items": int(len(self.item_matrix)),
+            "n_lists": self.n_lists,
+            "n_probe": self.n_probe,
+            "max_list_size": int(max(sizes)) if sizes else 0
+        }
+
+class LSHIndex(_CandidateIndex):
+    """랜덤 초평면 부호 비트로 버킷을 나누고, 여러 해시 테이블의 같은 버킷 아이템만 탐색"""
+    name = "lsh"
+
+    def __init__(self, item_matrix, n_tables=8, n_bits=8, seed=42):
+        super().__init__(item_matrix)
+        rng = np.random.default_rng(seed)
+        dim = item_matrix.shape[1]
+        self.n_tables = n_tables
+        self.n_bits = n_bits
+        self.hyperplanes = rng.standard_normal((n_tables, n_bits, dim)).astype(np.float32)
+        self._bit_weights = 1 << np.arange(n_bits, dtype=np.int64)
+
+        # 테이블별 버킷 키 → 아이템 행 번호 배열
+        keys = self._hash(np.asarray(item_matrix))
+        self.tables = []
+        for table_keys in keys:
+            order = np.argsort(table_keys, kind='stable')
+            unique_keys, starts = np.unique(table_keys[order], return_index=True)
+            ends = np.append(starts[1:], len(order))
+            self.tables.append({
+                int(key): order[start:end] for key, start, end in zip(unique_keys, starts, ends)
+            })
+
+    def _hash(self, vectors):
+        """(T, N) 버킷 키 (초평면 부호 비트를 정수로 묶음)"""
+        bits = np.einsum('tbd,nd->tnb', self.hyperplanes, vectors) > 0
+        return bits.astype(np.int64) @ self._bit_weights
+
+    def _candidates(self, query):
+        keys = self._hash(query[np.newaxis, :])[:, 0]
+        empty = np.array([], dtype=np.int64)
+        buckets = [table.get(int(key), empty) for table, key in zip(self.tables, keys)]
+        return np.unique(np.concatenate(buckets))
+
+    def stats(self):
+        return {
+            "index": self.name,
+            "items": int(len(self.item_matrix)),
+            "n_tables": self.n_tables,
+            "n_bits": self.n_bits,
+            "buckets": sum(len(table) for table in self.tables)
+        }
+
+def build_retrieval_index(item_matrix, config):
+    """설정에 따라 검색 인덱스 생성 (index: exact | ivf | lsh)"""
+    index_type = config.get("index", "exact")
+    if index_type == "exact":
+        return ExactIndex(item_matrix)
+    if index_type == "ivf":
+        return IVFFlatIndex(
+            item_matrix,
+            n_lists=config["ivf_n_lists"],
+            n_probe=config["ivf_n_probe"],
+            iterations=config["ivf_iterations"],
+            seed=config["seed"]
+        )
+    if index_type == "lsh":
+        return LSHIndex(
+            item_matrix,
+            n_tables=config["lsh_tables"],
+            n_bits=config["lsh_bits"],
+            seed=config["seed"]
+        )
+    raise ValueError(f"지원하지 않는 검색 인덱스: {index_type}")
+
+def _synthetic_catalog(item_matrix, n_items, seed=0):
+    """실제 아이템 두 개의 무작위 혼합 + 노이즈로 대규모 카탈로그를 흉내낸 정규화 행렬"""
+    rng = np.random.default_rng(seed)
+    item_matrix = np.asarray(item_matrix)
+    first = item_matrix[rng.integers(0, len(item_matrix), n_items)]
+    second = item_matrix[rng.integers(0, len(item_matrix), n_items)]
+    mix = rng.uniform(0, 1, (n_items, 1)).astype(np.float32)
+    base = mix * first + (1 - mix) * second
+    matrix = base + rng.normal(0, 0.3 / np.sqrt(base.shape[1]), base.shape).astype(np.float32)
+    return np.ascontiguousarray(matrix / np.linalg.norm(matrix, axis=1, keepdims=True), dtype=np.float32)
+
+def evaluate_indexes(item_matrix, queries, indexes, top_k=10):
+    """각 인덱스의 recall@k(exact 대비)와 query당 평균 검색 시간(ms)"""
+    exact = ExactIndex(item_matrix)
+    truth = [set(exact.search(query, top_k)[0].tolist()) for query in queries]
+    report = []
+    for index in indexes:
+        started = time.perf_counter()
+        results = [index.search(query, top_k)[0] for query in queries]
+        elapsed = time.perf_counter() - started
+        recall = np.mean([len(expected & set(found.tolist())) / len(expected) for expected, found in zip(truth, results)])
+        report.append({**index.stats(), "recall_at_k": float(recall), "latency_ms": elapsed / len(queries) * 1000})
+    return report
+
+# recall@k / 지연시간 비교 리포트
+if __name__ == "__main__":
+    import argparse
+    from utils.config import RECOMMENDATION_CONFIG, RETRIEVAL_CONFIG
+    from utils.engines.recommendation_engine import RecommendationEngine
+
+    parser = argparse.ArgumentParser(description="검색 인덱스별 recall@k 및 지연시간 비교")
+    parser.add_argument("--items", type=int, default=0, help="합성 카탈로그 크기 (0이면 실제 아이템만 사용)")
+    parser.add_argument("--queries", type=int, default=200, help="평가 query 수")
+    parser.add_argument("--top-k", type=int, default=RECOMMENDATION_CONFIG["diversity_candidate_pool"],
+                        help="검색 개수 (기본값: 다양성 재정렬 후보 개수)")
+    parser.add_argument("--n-probe", type=int, default=RETRIEVAL_CONFIG["ivf_n_probe"], help="IVF 탐색 클러스터 수")
+    parser.add_argument("--lsh-tables", type=int, default=RETRIEVAL_CONFIG["lsh_tables"], help="LSH 해시 테이블 수")
+    parser.add_argument("--lsh-bits", type=int, default=RETRIEVAL_CONFIG["lsh_bits"], help="LSH 테이블당 비트 수")
+    args = parser.parse_args()
+    config = {**RETRIEVAL_CONFIG, "ivf_n_probe": args.n_probe, "lsh_tables": args.lsh_tables, "lsh_bits": args.lsh_bits}
+
+    engine = RecommendationEngine()
+    engine.load_model()
+    item_matrix = engine.model['item_matrix']
+    if args.items > 0:
+        item_matrix = _synthetic_catalog(item_matrix, args.items)
+
+    # 실제 성격 특성 조합으로 User 벡터 생성
+    rng = np.random.default_rng(0)
+    trait_names = [name for name, node_id in engine.node_index.name_to_id.items()
+                   if engine.node_index.id_to_type.get(node_id) != 'item']
+    queries = []
+    for _ in range(args.queries):
+        names = rng.choice(trait_names, size=min(8, len(trait_names)), replace=False)
+        weights = {str(name): float(rng.uniform(-1, 1)) for name in names}
+        vector = engine._generate_user_embedding(engine._get_user_edges(weights), rng).astype(np.float32)
+        queries.append(vector / (np.linalg.norm(vector) or 1.0))
+
+    indexes = [build_retrieval_index(item_matrix, {**config, "index": index_type})
+               for index_type in ("exact", "ivf", "lsh")]
+    print(f"아이템 {len(item_matrix)}개, query {len(queries)}개, top-{args.top_k}")
+    for row in evaluate_indexes(item_matrix, queries, indexes, top_k=args.top_k):
+        print(f"{row['index']:>6}  recall@{args.top_k}={row['recall_at_k']:.3f}  {row['latency_ms']:.3f} ms/query  {row}")
@@ -3,69 +3,76 @@
 """
 import pandas as pd
 from pathlib import Path
+from utils.metrics import stage_timer
 
 class ScoringCalculator:
+    @stage_timer("load", "scoring_tables")
     def __init__(self):
         # 백엔드 구조에 맞게 경로 설정
         backend_root = Path(__file__).parent.parent.parent
         self.base_path = backend_root / "data" / "psychology-question"
         
-        # 참조 파일들 로드
-        self.choice_2_data = pd.read_csv(self.base_path / "2-choice-question.csv")
-        self.choice_4_data = pd.read_csv(self.base_path / "4-choice-question.csv")
-        self.choice_5_data = pd.read_csv(self.base_path / "5-point-question.csv")
-        self.choice_ox_data = pd.read_csv(self.base_path / "O-X-question.csv")
+        # 참조 파일들을 질문별 부호 조회 테이블로 컴파일 (요청 처리 시 pandas 미사용)
+        self.choice_2_table = self._compile_table(
+            pd.read_csv(self.base_path / "2-choice-question.csv"), ['pn_response_1', 'pn_response_2'])
+        self.choice_4_table = self._compile_table(
+            pd.read_csv(self.base_path / "4-choice-question.csv"), [f'pn_response_{i}' for i in range(1, 5)])
+        self.choice_5_table = self._compile_table(
+            pd.read_csv(self.base_path / "5-point-question.csv"), ['positive_negative_relation'])
+        self.choice_ox_table = self._compile_table(
+            pd.read_csv(self.base_path / "O-X-question.csv"), ['pn_response_1', 'pn_response_2'])
         
+        # 질문 ID(trait_{idx}) → 질문 문구
+        trait_questions = pd.read_csv(self.base_path / "trait-question.csv")
+        self.question_ids = {f"trait_{idx}": question for idx, question in enumerate(trait_questions['question'])}
+        
+    @staticmethod
+    def _compile_table(df, sign_columns):
+        """질문 문구 → 선택지별 부호(+1/-1) 튜플 (중복 질문은 첫 행 기준)"""
+        table = {}
+        for row in df[['question'] + sign_columns].itertuples(index=False):
+            signs = tuple(1 if sign == '+' else (-1 if sign == '-' else 0) for sign in row[1:])
+            table.setdefault(row[0], signs)
+        return table
+    
+    def _lookup_signs(self, table, question):
+        """질문 ID 또는 문구로 부호 튜플 조회"""
+        return table.get(self.question_ids.get(question, question))
+    
+    @staticmethod
+    def new_score_state():
+        """노드별 누적 합계/개수 (세션에 저장하여 증분 계산에 사용)"""
+        return {'sums': {}, 'counts': {}}
+    
     def calculate_user_weights(self, answers):
         """사용자 답변을 기반으로 노드별 가중치 계산"""
-        user_weights = {}
+        state = self.new_score_state()
+        self.accumulate(state, answers.values())
+        return self.finalize_weights(state)
+    
+    def accumulate(self, state, answers):
+        """새 답변들의 가중치만 누적 합계/개수에 반영"""
+        sums = state['sums']
+        counts = state['counts']
         
-        for answer_id, answer_data in answers.items():
-            # 프론트엔드 데이터 형식에 맞게 수정
-            target_node = answer_data.get('target_node', 'Openness')
-            answer_text = answer_data.get('answer', '')
-            
-            # 답변 형식에 따라 질문 타입 추정
-            if answer_text in ['O', 'X']:
-                question_type = "O_X_question"
-                choice_index = 0 if answer_text == 'O' else 1
-            elif answer_text.startswith('1(') or answer_text in ['1', '2', '3', '4', '5']:
-                question_type = "5_point_question"
-                if answer_text.startswith('1('):
-                    choice_index = 0
-                else:
-                    choice_index = int(answer_text) - 1
-            elif len(answer_text) > 10:  # 긴 텍스트는 2선택 또는 4선택
-                question_type = "2_choice_question"
-                choice_index = 0  # 임시값
-            else:
-                question_type = "2_choice_question"
-                choice_index = 0
-            
-            selected_choice = answer_text
-            question = f"Question for {target_node}"
-            
-            # 질문 타입별 가중치 계산
-            if question_type == "5_point_question":
-                weight = self._calculate_5point_weight(question, selected_choice, choice_index, target_node)
-            elif question_type == "2_choice_question":
-                weight = self._calculate_2choice_weight(question, choice_index)
-            elif question_type == "4_choice_question":
-                weight = self._calculate_4choice_weight(question, choice_index)
-            elif question_type == "O_X_question":
-                weight = self._calculate_ox_weight(question, choice_index)
-            else:
+        for answer_data in answers:
+            scored = self._score_answer(answer_data)
+            if scored is None:
                 continue
-                
-            # 가중치 저장
-            if target_node not in user_weights:
-                user_weights[target_node] = []
-            user_weights[target_node].append(weight)
+            target_node, weight = scored
+            
+            # 가중치 누적
+            sums[target_node] = sums.get(target_node, 0) + weight
+            counts[target_node] = counts.get(target_node, 0) + 1
         
+        return state
+    
+    def finalize_weights(self, state):
+        """누적 합계/개수로 최종 가중치 계산 (state는 변경하지 않음)"""
         # 동일 노드의 다중 질문은 평균값 사용
         final_weights = {}
-        for node, weights in user_weights.items():
-            final_weights[node] = sum(weights) / len(weights)
+        for node, total in state['sums'].items():
+            final_weights[node] = total / state['counts'][node]
         
         # Pref_ 노드 처리
         self._process_pref_nodes(final_weights)
@@ -76,50 +83,79 @@ class ScoringCalculator:
             
         return final_weights
     
+    def _score_answer(self, answer_data):
+        """답변 하나를 (대상 노드, 가중치)로 변환"""
+        # 프론트엔드 데이터 형식에 맞게 수정
+        target_node = answer_data.get('target_node', 'Openness')
+        answer_text = answer_data.get('answer', '')
+        
+        # 답변 형식에 따라 질문 타입 추정
+        if answer_text in ['O', 'X']:
+            question_type = "O_X_question"
+            choice_index = 0 if answer_text == 'O' else 1
+        elif answer_text.startswith('1(') or answer_text in ['1', '2', '3', '4', '5']:
+            question_type = "5_point_question"
+            if answer_text.startswith('1('):
+                choice_index = 0
+            else:
+                choice_index = int(answer_text) - 1
+        elif len(answer_text) > 10:  # 긴 텍스트는 2선택 또는 4선택
+            question_type = "2_choice_question"
+            choice_index = 0  # 임시값
+        else:
+            question_type = "2_choice_question"
+            choice_index = 0
+        
+        selected_choice = answer_text
+        question = f"Question for {target_node}"
+        
+        # 질문 타입별 가중치 계산
+        if question_type == "5_point_question":
+            weight = self._calculate_5point_weight(question, selected_choice, choice_index, target_node)
+        elif question_type == "2_choice_question":
+            weight = self._calculate_2choice_weight(question, choice_index)
+        elif question_type == "4_choice_question":
+            weight = self._calculate_4choice_weight(question, choice_index)
+        elif question_type == "O_X_question":
+            weight = self._calculate_ox_weight(question, choice_index)
+        else:
+            return None
+        
+        return target_node, weight
+    
     def _calculate_5point_weight(self, question, selected_choice, choice_index, target_node):
         """5-point 질문 가중치 계산"""
         # 1->0.2, 2->0.4, 3->0.6, 4->0.8, 5->1.0
         base_weight = (choice_index + 1) * 0.2
         
         # positive_negative_relation 확인
-        relation_row = self.choice_5_data[self.choice_5_data['question'] == question]
-        if not relation_row.empty:
-            relation = relation_row.iloc[0]['positive_negative_relation']
-            if relation == '-':
-                base_weight = -base_weight
+        signs = self._lookup_signs(self.choice_5_table, question)
+        if signs is not None and signs[0] == -1:
+            base_weight = -base_weight
         
         return base_weight
     
     def _calculate_2choice_weight(self, question, choice_index):
         """2-choice 질문 가중치 계산"""
-        relation_row = self.choice_2_data[self.choice_2_data['question'] == question]
-        if not relation_row.empty:
-            row = relation_row.iloc[0]
-            if choice_index == 0:  # response_1
-                return 0.7 if row['pn_response_1'] == '+' else -0.7
-            else:  # response_2
-                return 0.7 if row['pn_response_2'] == '+' else -0.7
+        signs = self._lookup_signs(self.choice_2_table, question)
+        if signs is not None:
+            # response_1 / response_2
+            return 0.7 if signs[0 if choice_index == 0 else 1] == 1 else -0.7
         return 0.0
     
     def _calculate_4choice_weight(self, question, choice_index):
         """4-choice 질문 가중치 계산"""
-        relation_row = self.choice_4_data[self.choice_4_data['question'] == question]
-        if not relation_row.empty:
-            row = relation_row.iloc[0]
-            pn_col = f'pn_response_{choice_index + 1}'
-            if pn_col in row:
-                return 0.7 if row[pn_col] == '+' else -0.7
+        signs = self._lookup_signs(self.choice_4_table, question)
+        if signs is not None and 0 <= choice_index < len(signs):
+            return 0.7 if signs[choice_index] == 1 else -0.7
         return 0.0
     
     def _calculate_ox_weight(self, question, choice_index):
         """O-X 질문 가중치 계산"""
-        relation_row = self.choice_ox_data[self.choice_ox_data['question'] == question]
-        if not relation_row.empty:
-            row = relation_row.iloc[0]
-            if choice_index == 0:  # O
-                return 0.7 if row['pn_response_1'] == '+' else -0.7
-            else:  # X
-                return 0.7 if row['pn_response_2'] == '+' else -0.7
+        signs = self._lookup_signs(self.choice_ox_table, question)
+        if signs is not None:
+            # O / X
+            return 0.7 if signs[0 if choice_index == 0 else 1] == 1 else -0.7
         return 0.0
     
     def _process_pref_nodes(self, weights):
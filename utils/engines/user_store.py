@@ -0,0 +1,96 @@
+"""
+User 임베딩 저장소 - 세션 단위 임시 임베딩을 TTL/LRU로 제한하여 보관
+"""
+import threading
+import time
+from collections import OrderedDict
+
+class UserEmbeddingStore:
+    def __init__(self, max_entries=10000, ttl_seconds=3600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # key -> (embedding, 만료 시각), 오래 사용되지 않은 순서로 정렬
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._nbytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def put(self, key, embedding):
+        """User 임베딩 저장 (용량 초과 시 가장 오래된 항목 제거)"""
+        embedding.setflags(write=False)
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._nbytes -= previous[0].nbytes
+            self._entries[key] = (embedding, expires_at)
+            self._nbytes += embedding.nbytes
+
+            while len(self._entries) > self.max_entries:
+                _, (evicted, _) = self._entries.popitem(last=False)
+                self._nbytes -= evicted.nbytes
+                self._evictions += 1
+
+    def get(self, key):
+        """User 임베딩 조회 (만료되었거나 없으면 None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            embedding, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self._nbytes -= embedding.nbytes
+                self._expirations += 1
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return embedding
+
+    def remove(self, key):
+        """세션 종료 시 User 임베딩 제거"""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._nbytes -= entry[0].nbytes
+            return entry is not None
+
+    def purge_expired(self):
+        """만료된 항목 일괄 제거"""
+        now = time.monotonic()
+        with self._lock:
+            expired = [key for key, (_, expires_at) in self._entries.items() if expires_at <= now]
+            for key in expired:
+                embedding, _ = self._entries.pop(key)
+                self._nbytes -= embedding.nbytes
+            self._expirations += len(expired)
+        return len(expired)
+
+    def stats(self):
+        """메모리 사용량 및 적중률 통계"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "bytes": self._nbytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations
+            }
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,199 @@
+"""
+GPT 응답 캐시 - 프롬프트 입력의 정규화 해시를 키로 성격 분석 결과 재사용
+
+사용자 이름은 키에서 제외하고(자리표시자로 치환) 조회 후 실제 이름으로 되돌린다.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+USER_NAME_PLACEHOLDER = "<<user_name>>"
+
+class MemoryCacheBackend:
+    """프로세스 내 LRU + TTL 캐시"""
+    blocking = False
+
+    def __init__(self, max_entries=5000, ttl_seconds=86400):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (value, time.time() + self.ttl_seconds)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+class SQLiteCacheBackend:
+    """파일 기반 SQLite 캐시 (재시작/워커 간 공유, TTL + 크기 제한)"""
+    # 디스크 I/O와 busy timeout 대기가 있으므로 비동기 서비스에서는 스레드에서 호출
+    blocking = True
+
+    def __init__(self, path, max_entries=50000, ttl_seconds=86400):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.evictions = 0
+        self._connect()
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS gpt_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_gpt_cache_accessed ON gpt_cache (accessed_at)")
+        self._conn.commit()
+        # SQLite 연결은 fork 후 공유할 수 없으므로 워커 프로세스에서 새로 연결
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._connect)
+
+    def _connect(self):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=5.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM gpt_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._conn.execute("DELETE FROM gpt_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE gpt_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        return json.loads(row[0])
+
+    def set(self, key, value):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO gpt_cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False, separators=(',', ':')), now + self.ttl_seconds, now)
+            )
+            self._conn.execute("DELETE FROM gpt_cache WHERE expires_at <= ?", (now,))
+            overflow = self._count() - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM gpt_cache WHERE key IN "
+                    "(SELECT key FROM gpt_cache ORDER BY accessed_at LIMIT ?)", (overflow,)
+                )
+                self.evictions += overflow
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM gpt_cache")
+            self._conn.commit()
+
+    def _count(self):
+        return self._conn.execute("SELECT COUNT(*) FROM gpt_cache").fetchone()[0]
+
+    def __len__(self):
+        with self._lock:
+            return self._count()
+
+class GPTResponseCache:
+    def __init__(self, backend):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.skipped = 0
+
+    @property
+    def blocking(self) -> bool:
+        """get/set이 I/O로 이벤트 루프를 막을 수 있는지 여부"""
+        return self.backend.blocking
+
+    @staticmethod
+    def make_key(model: str, request: Dict[str, Any]) -> str:
+        """모델 + 프롬프트 요청(이름은 자리표시자)의 정규화 JSON 해시"""
+        canonical = json.dumps([model, request], ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def get(self, key: str, user_name: str) -> Optional[Dict[str, str]]:
+        """캐시 조회 후 자리표시자를 실제 사용자 이름으로 치환"""
+        value = self.backend.get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return {field: text.replace(USER_NAME_PLACEHOLDER, user_name) for field, text in value.items()}
+
+    def set(self, key: str, user_name: str, result: Dict[str, str]) -> bool:
+        """'이름+님' 표현을 자리표시자로 바꿔 저장 (다른 위치에 이름이 남으면 저장하지 않음)"""
+        templated = {}
+        for field, text in result.items():
+            if user_name:
+                text = text.replace(f"{user_name}님", f"{USER_NAME_PLACEHOLDER}님")
+                if user_name in text.replace(USER_NAME_PLACEHOLDER, ""):
+                    with self._lock:
+                        self.skipped += 1
+                    return False
+            templated[field] = text
+        self.backend.set(key, templated)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": type(self.backend).__name__,
+                "entries": len(self.backend),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "skipped": self.skipped,
+                "evictions": self.backend.evictions
+            }
+
+def create_gpt_cache(config) -> Optional[GPTResponseCache]:
+    """설정에 따라 캐시 생성 (backend: memory | sqlite | none)"""
+    backend_name = config.get("backend", "memory")
+    if backend_name == "none":
+        return None
+    if backend_name == "sqlite":
+        backend = SQLiteCacheBackend(
+            config["sqlite_path"],
+            max_entries=config["max_entries"],
+            ttl_seconds=config["ttl_seconds"]
+        )
+    elif backend_name == "memory":
+        backend = MemoryCacheBackend(max_entries=config["max_entries"], ttl_seconds=config["ttl_seconds"])
+    else:
+        raise ValueError(f"지원하지 않는 GPT 캐시 백엔드: {backend_name}")
+    return GPTResponseCache(backend)
@@ -1,28 +1,39 @@
+import asyncio
+import functools
 import os
 import openai
 from typing import Dict, Any
 from dotenv import load_dotenv
+from utils.config import GPT_CONFIG, GPT_CACHE_CONFIG
+from utils.gpt_cache import USER_NAME_PLACEHOLDER, GPTResponseCache, create_gpt_cache
+from utils.logger import get_logger
+from utils.metrics import GPT_CALLS, GPT_REQUEST_SECONDS, record_gpt_usage
+
+logger = get_logger(__name__)
 
 # 환경변수 로드
 load_dotenv()
 
-class GPTService:
-    def __init__(self):
-        self.client = openai.OpenAI(
-            api_key=os.getenv("OPENAI_API_KEY")
-        )
-    
-    def generate_intermediate_result(self, user_traits: Dict[str, float], user_name: str) -> Dict[str, str]:
-        """
-        중간 결과 생성: 사용자의 성격 특성을 바탕으로 한 단어와 설명 생성
-        """
+# 동기/비동기 서비스가 함께 사용하는 응답 캐시
+gpt_cache = create_gpt_cache(GPT_CACHE_CONFIG)
+
+def _total_timeout(config) -> float:
+    """재시도를 포함한 전체 호출 제한 시간 (시도별 timeout × 시도 횟수 + openai 클라이언트 백오프 최대값 0.5초×2^n, 최대 8초)"""
+    retries = config["max_retries"]
+    backoff = sum(min(0.5 * 2 ** attempt, 8.0) for attempt in range(retries))
+    return (retries + 1) * config["timeout"] + backoff
+
+class BaseGPTService:
+    """프롬프트 구성 및 응답 파싱 (동기/비동기 클라이언트 공통)"""
+
+    def _intermediate_request(self, user_traits: Dict[str, float], user_name: str) -> Dict[str, Any]:
         # 가장 높은 점수의 특성들 추출
         top_traits = sorted(user_traits.items(), key=lambda x: x[1], reverse=True)[:3]
         trait_descriptions = []
-        
+
         for trait, score in top_traits:
             trait_descriptions.append(f"{trait}: {score:.2f}")
-        
+
         prompt = f"""
 사용자 {user_name}님의 심리테스트 중간 결과를 분석해주세요.
 
@@ -37,50 +48,18 @@ class GPTService:
 성격유형: [한 단어/구문]
 설명: [짧은 설명]
 """
+        return {
+            "messages": [
+                {"role": "system", "content": "당신은 심리학 전문가입니다. 성격 분석을 정확하고 간결하게 제공합니다."},
+                {"role": "user", "content": prompt}
+            ],
+            "max_tokens": 150,
+            "temperature": 0.7
+        }
 
-        try:
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "당신은 심리학 전문가입니다. 성격 분석을 정확하고 간결하게 제공합니다."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=150,
-                temperature=0.7
-            )
-            
-            result_text = response.choices[0].message.content.strip()
-            
-            # 응답 파싱
-            lines = result_text.split('\n')
-            personality_type = ""
-            description = ""
-            
-            for line in lines:
-                if line.startswith("성격유형:"):
-                    personality_type = line.replace("성격유형:", "").strip()
-                elif line.startswith("설명:"):
-                    description = line.replace("설명:", "").strip()
-            
-            return {
-                "personality_type": personality_type or "분석 중인 성격",
-                "description": description or "현재까지의 결과를 분석하고 있습니다."
-            }
-            
-        except Exception as e:
-            print(f"GPT API 오류: {e}")
-            # 기본값 반환
-            return {
-                "personality_type": "분석 중인 성격",
-                "description": "현재까지의 결과를 종합하여 분석하고 있습니다."
-            }
-    
-    def generate_intermediate_result_from_answers(self, answer_summary: list, user_name: str) -> Dict[str, str]:
-        """
-        답변 내용을 직접 분석하여 중간 결과 생성
-        """
+    def _intermediate_from_answers_request(self, answer_summary: list, user_name: str) -> Dict[str, Any]:
         answers_text = "\n".join(answer_summary)
-        
+
         prompt = f"""
 사용자 {user_name}님의 심리테스트 중간 답변을 분석해주세요.
 
@@ -95,57 +74,26 @@ class GPTService:
 성격유형: [한 단어/구문]
 설명: [짧은 설명]
 """
+        return {
+            "messages": [
+                {"role": "system", "content": "당신은 심리학 전문가입니다. 답변 내용을 바탕으로 성격을 분석합니다."},
+                {"role": "user", "content": prompt}
+            ],
+            "max_tokens": 150,
+            "temperature": 0.7
+        }
 
-        try:
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "당신은 심리학 전문가입니다. 답변 내용을 바탕으로 성격을 분석합니다."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=150,
-                temperature=0.7
-            )
-            
-            result_text = response.choices[0].message.content.strip()
-            
-            # 응답 파싱
-            lines = result_text.split('\n')
-            personality_type = ""
-            description = ""
-            
-            for line in lines:
-                if line.startswith("성격유형:"):
-                    personality_type = line.replace("성격유형:", "").strip()
-                elif line.startswith("설명:"):
-                    description = line.replace("설명:", "").strip()
-            
-            return {
-                "personality_type": personality_type or "분석 중인 성격",
-                "description": description or "현재까지의 답변을 바탕으로 분석한 결과입니다."
-            }
-            
-        except Exception as e:
-            print(f"GPT API 오류: {e}")
-            return {
-                "personality_type": "분석 중인 성격",
-                "description": "현재까지의 답변을 바탕으로 분석하고 있습니다."
-            }
-    
-    def generate_final_result(self, user_traits: Dict[str, float], user_name: str, all_answers: list) -> Dict[str, str]:
-        """
-        최종 결과 생성: 모든 답변과 성격 특성을 바탕으로 더 구체적인 분석 제공
-        """
+    def _final_request(self, user_traits: Dict[str, float], user_name: str, all_answers: list) -> Dict[str, Any]:
         # 성격 특성 점수를 텍스트로 변환
         trait_descriptions = []
         for trait, score in user_traits.items():
             trait_descriptions.append(f"{trait}: {score:.2f}")
-        
+
         # 답변 요약
         answers_summary = []
-        for i, answer in enumerate(all_answers[:44]):  
+        for i, answer in enumerate(all_answers[:44]):
             answers_summary.append(f"Q{i+1}: {answer.get('answer', 'N/A')}")
-        
+
         prompt = f"""
 {user_name}님의 심리테스트가 완료되었습니다. 최종 분석을 제공해주세요.
 
@@ -165,39 +113,242 @@ class GPTService:
 성격유형: [성격 유형]
 설명: [상세 설명]
 """
+        return {
+            "messages": [
+                {"role": "system", "content": "당신은 전문 심리학자입니다. 사용자의 성격을 긍정적이고 구체적으로 분석하여 매력적인 결과를 제공합니다."},
+                {"role": "user", "content": prompt}
+            ],
+            "max_tokens": 200,
+            "temperature": 0.8
+        }
+
+    def _parse_result(self, response, default_type: str, default_description: str) -> Dict[str, str]:
+        result_text = response.choices[0].message.content.strip()
 
+        # 응답 파싱
+        lines = result_text.split('\n')
+        personality_type = ""
+        description = ""
+
+        for line in lines:
+            if line.startswith("성격유형:"):
+                personality_type = line.replace("성격유형:", "").strip()
+            elif line.startswith("설명:"):
+                description = line.replace("설명:", "").strip()
+
+        return {
+            "personality_type": personality_type or default_type,
+            "description": description or default_description
+        }
+
+    def _final_default_description(self, user_name: str) -> str:
+        return f"{user_name}님은 독특하고 매력적인 성격을 가지고 계십니다. 당신만의 특별한 개성이 돋보입니다."
+
+    def _cache_key(self, build_request) -> str:
+        """이름을 자리표시자로 바꾼 프롬프트 요청으로 캐시 키 생성"""
+        if self.cache is None:
+            return None
+        return GPTResponseCache.make_key(GPT_CONFIG["model"], build_request(USER_NAME_PLACEHOLDER))
+
+    def _cache_get(self, cache_key, user_name: str):
+        if cache_key is None:
+            return None
+        return self.cache.get(cache_key, user_name)
+
+    def _cache_set(self, cache_key, user_name: str, result: Dict[str, str]):
+        if cache_key is not None:
+            self.cache.set(cache_key, user_name, result)
+
+class GPTService(BaseGPTService):
+    def __init__(self, cache=gpt_cache):
+        self.client = openai.OpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            timeout=GPT_CONFIG["timeout"],
+            max_retries=GPT_CONFIG["max_retries"]
+        )
+        self.cache = cache
+
+    def _complete(self, request: Dict[str, Any]):
+        return self.client.chat.completions.create(model=GPT_CONFIG["model"], **request)
+
+    def _generate(self, kind: str, build_request, user_name: str, default_type: str, default_description: str) -> Dict[str, str]:
+        """캐시 조회 후 없으면 GPT 호출 및 결과 저장"""
+        cache_key = self._cache_key(build_request)
+        cached = self._cache_get(cache_key, user_name)
+        if cached is not None:
+            GPT_CALLS.inc(kind=kind, outcome="cache_hit")
+            return cached
+
+        try:
+            with GPT_REQUEST_SECONDS.time(kind=kind):
+                response = self._complete(build_request(user_name))
+        except Exception:
+            GPT_CALLS.inc(kind=kind, outcome="failure")
+            raise
+        GPT_CALLS.inc(kind=kind, outcome="success")
+        record_gpt_usage(kind, response)
+        result = self._parse_result(response, default_type, default_description)
+        self._cache_set(cache_key, user_name, result)
+        return result
+
+    def generate_intermediate_result(self, user_traits: Dict[str, float], user_name: str) -> Dict[str, str]:
+        """
+        중간 결과 생성: 사용자의 성격 특성을 바탕으로 한 단어와 설명 생성
+        """
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "당신은 전문 심리학자입니다. 사용자의 성격을 긍정적이고 구체적으로 분석하여 매력적인 결과를 제공합니다."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=200,
-                temperature=0.8
+            return self._generate(
+                "intermediate",
+                lambda name: self._intermediate_request(user_traits, name),
+                user_name, "분석 중인 성격", "현재까지의 결과를 분석하고 있습니다."
             )
-            
-            result_text = response.choices[0].message.content.strip()
-            
-            # 응답 파싱
-            lines = result_text.split('\n')
-            personality_type = ""
-            description = ""
-            
-            for line in lines:
-                if line.startswith("성격유형:"):
-                    personality_type = line.replace("성격유형:", "").strip()
-                elif line.startswith("설명:"):
-                    description = line.replace("설명:", "").strip()
-            
+
+        except Exception as e:
+            logger.warning("GPT API 오류: %r", e)
+            # 기본값 반환
             return {
-                "personality_type": personality_type or "매력적인 개성",
-                "description": description or f"{user_name}님은 독특하고 매력적인 성격을 가지고 계십니다. 당신만의 특별한 개성이 돋보입니다."
+                "personality_type": "분석 중인 성격",
+                "description": "현재까지의 결과를 종합하여 분석하고 있습니다."
             }
-            
+
+    def generate_intermediate_result_from_answers(self, answer_summary: list, user_name: str) -> Dict[str, str]:
+        """
+        답변 내용을 직접 분석하여 중간 결과 생성
+        """
+        try:
+            return self._generate(
+                "intermediate_answers",
+                lambda name: self._intermediate_from_answers_request(answer_summary, name),
+                user_name, "분석 중인 성격", "현재까지의 답변을 바탕으로 분석한 결과입니다."
+            )
+
+        except Exception as e:
+            logger.warning("GPT API 오류: %r", e)
+            return {
+                "personality_type": "분석 중인 성격",
+                "description": "현재까지의 답변을 바탕으로 분석하고 있습니다."
+            }
+
+    def generate_final_result(self, user_traits: Dict[str, float], user_name: str, all_answers: list) -> Dict[str, str]:
+        """
+        최종 결과 생성: 모든 답변과 성격 특성을 바탕으로 더 구체적인 분석 제공
+        """
+        try:
+            return self._generate(
+                "final",
+                lambda name: self._final_request(user_traits, name, all_answers),
+                user_name, "매력적인 개성", self._final_default_description(user_name)
+            )
+
+        except Exception as e:
+            logger.warning("GPT API 오류: %r", e)
+            return {
+                "personality_type": "매력적인 개성",
+                "description": self._final_default_description(user_name)
+            }
+
+class AsyncGPTService(BaseGPTService):
+    """이벤트 루프를 막지 않는 비동기 GPT 클라이언트 (타임아웃 + 동시 호출 수 제한)"""
+
+    def __init__(self, cache=gpt_cache):
+        self.client = openai.AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            timeout=GPT_CONFIG["timeout"],
+            max_retries=GPT_CONFIG["max_retries"]
+        )
+        self.cache = cache
+        self.max_concurrency = GPT_CONFIG["max_concurrency"]
+        # 바깥 timeout이 시도별 timeout과 같으면 클라이언트 재시도가 실행되기 전에 취소되므로 재시도 시간까지 포함
+        self.total_timeout = _total_timeout(GPT_CONFIG)
+        self._semaphore = None
+
+    async def _complete(self, request: Dict[str, Any]):
+        # 세마포어는 실행 중인 이벤트 루프에서 생성
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async with self._semaphore:
+            return await asyncio.wait_for(
+                self.client.chat.completions.create(model=GPT_CONFIG["model"], **request),
+                timeout=self.total_timeout
+            )
+
+    async def _run_cache_call(self, func, *args):
+        """I/O가 있는 캐시 백엔드(SQLite)는 스레드에서 실행해 이벤트 루프를 막지 않음"""
+        if self.cache is None or not self.cache.blocking:
+            return func(*args)
+        return await asyncio.get_running_loop().run_in_executor(None, functools.partial(func, *args))
+
+    async def _generate(self, kind: str, build_request, user_name: str, default_type: str, default_description: str) -> Dict[str, str]:
+        """캐시 조회 후 없으면 GPT 호출 및 결과 저장"""
+        cache_key = self._cache_key(build_request)
+        cached = await self._run_cache_call(self._cache_get, cache_key, user_name)
+        if cached is not None:
+            GPT_CALLS.inc(kind=kind, outcome="cache_hit")
+            return cached
+
+        try:
+            with GPT_REQUEST_SECONDS.time(kind=kind):
+                response = await self._complete(build_request(user_name))
+        except Exception:
+            GPT_CALLS.inc(kind=kind, outcome="failure")
+            raise
+        GPT_CALLS.inc(kind=kind, outcome="success")
+        record_gpt_usage(kind, response)
+        result = self._parse_result(response, default_type, default_description)
+        await self._run_cache_call(self._cache_set, cache_key, user_name, result)
+        return result
+
+    async def generate_intermediate_result(self, user_traits: Dict[str, float], user_name: str) -> Dict[str, str]:
+        """
+        중간 결과 생성: 사용자의 성격 특성을 바탕으로 한 단어와 설명 생성
+        """
+        try:
+            return await self._generate(
+                "intermediate",
+                lambda name: self._intermediate_request(user_traits, name),
+                user_name, "분석 중인 성격", "현재까지의 결과를 분석하고 있습니다."
+            )
+
         except Exception as e:
-            print(f"GPT API 오류: {e}")
+            logger.warning("GPT API 오류: %r", e)
+            return {
+                "personality_type": "분석 중인 성격",
+                "description": "현재까지의 결과를 종합하여 분석하고 있습니다."
+            }
+
+    async def generate_intermediate_result_from_answers(self, answer_summary: list, user_name: str) -> Dict[str, str]:
+        """
+        답변 내용을 직접 분석하여 중간 결과 생성
+        """
+        try:
+            return await self._generate(
+                "intermediate_answers",
+                lambda name: self._intermediate_from_answers_request(answer_summary, name),
+                user_name, "분석 중인 성격", "현재까지의 답변을 바탕으로 분석한 결과입니다."
+            )
+
+        except Exception as e:
+            logger.warning("GPT API 오류: %r", e)
+            return {
+                "personality_type": "분석 중인 성격",
+                "description": "현재까지의 답변을 바탕으로 분석하고 있습니다."
+            }
+
+    async def generate_final_result(self, user_traits: Dict[str, float], user_name: str, all_answers: list) -> Dict[str, str]:
+        """
+        최종 결과 생성: 모든 답변과 성격 특성을 바탕으로 더 구체적인 분석 제공
+        """
+        try:
+            return await self._generate(
+                "final",
+                lambda name: self._final_request(user_traits, name, all_answers),
+                user_name, "매력적인 개성", self._final_default_description(user_name)
+            )
+
+        except Exception as e:
+            logger.warning("GPT API 오류: %r", e)
             return {
                 "personality_type": "매력적인 개성",
-                "description": f"{user_name}님은 독특하고 매력적인 성격을 가지고 계십니다. 당신만의 특별한 개성이 돋보입니다."
-            }
\ No newline at end of file
+                "description": self._final_default_description(user_name),
+                "is_fallback": True
+            }
@@ -0,0 +1,94 @@
+"""
+로깅 설정 - LOGGING_CONFIG 기반 QueueHandler/QueueListener
+
+요청 처리 스레드는 로그 레코드를 큐에 넣기만 하고, 포맷팅과 콘솔/파일 출력은 별도 스레드에서 처리한다.
+메시지는 %-스타일 인자로 전달하여 레벨이 꺼져 있으면 문자열을 만들지 않는다.
+"""
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+from pathlib import Path
+from utils.config import LOGGING_CONFIG
+
+ROOT_LOGGER_NAME = "santapick"
+
+_config = None
+_handlers = None
+_listener = None
+
+def get_logger(name: str) -> logging.Logger:
+    """santapick 하위 로거 반환 (예: get_logger(__name__))"""
+    return logging.getLogger(f"{ROOT_LOGGER_NAME}.{name}")
+
+def _worker_log_file(log_file, pid):
+    """워커별 로그 파일 경로 (recommendation.log → recommendation.<pid>.log)"""
+    log_file = Path(log_file)
+    return log_file.with_name(f"{log_file.stem}.{pid}{log_file.suffix}")
+
+def _build_handlers(config, pid=None):
+    formatter = logging.Formatter(config["format"])
+    handlers = [logging.StreamHandler()]
+    if config.get("log_file"):
+        log_file = Path(config["log_file"])
+        if pid is not None:
+            log_file = _worker_log_file(log_file, pid)
+        log_file.parent.mkdir(parents=True, exist_ok=True)
+        handlers.append(logging.handlers.RotatingFileHandler(
+            log_file,
+            maxBytes=config["max_bytes"],
+            backupCount=config["backup_count"],
+            encoding="utf-8"
+        ))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+def _start_listener():
+    """새 큐와 출력 스레드 시작 (fork된 워커에서도 다시 호출)"""
+    global _listener
+    log_queue = queue.SimpleQueue()
+    root_logger = logging.getLogger(ROOT_LOGGER_NAME)
+    for handler in list(root_logger.handlers):
+        root_logger.removeHandler(handler)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    _listener = logging.handlers.QueueListener(log_queue, *_handlers, respect_handler_level=True)
+    _listener.start()
+
+def _restart_in_child():
+    """fork된 워커는 자기 로그 파일로 출력 스레드 재시작
+
+    여러 프로세스가 같은 파일을 각자 RotatingFileHandler로 교체하면 교체 시점에 로그가 섞이거나 유실되므로
+    부모에게서 물려받은 파일 핸들러는 닫고 프로세스 ID를 붙인 파일을 사용한다.
+    """
+    global _handlers
+    for handler in _handlers:
+        handler.close()
+    _handlers = _build_handlers(_config, pid=os.getpid())
+    _start_listener()
+
+def stop_logging():
+    """큐에 남은 로그를 모두 출력하고 출력 스레드 종료"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+def setup_logging(config=LOGGING_CONFIG):
+    """santapick 로거에 큐 기반 핸들러 연결 (여러 번 호출해도 한 번만 설정)"""
+    global _config, _handlers
+    if _handlers is not None:
+        return
+
+    root_logger = logging.getLogger(ROOT_LOGGER_NAME)
+    root_logger.setLevel(config["level"])
+    root_logger.propagate = False
+
+    _config = config
+    _handlers = _build_handlers(config)
+    _start_listener()
+    atexit.register(stop_logging)
+    # 출력 스레드는 fork 후 자식 프로세스에 남지 않으므로 워커에서 다시 시작
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=_restart_in_child)
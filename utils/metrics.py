@@ -0,0 +1,179 @@
+"""
+성능 지표 - 단계별 처리 시간 히스토그램, GPT 호출/토큰 카운터, 캐시 적중률을 Prometheus 텍스트 포맷으로 제공
+
+값은 프로세스 단위로 집계된다 (멀티 워커에서는 워커별 /metrics 응답).
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    """단조 증가 카운터 (라벨 조합별)"""
+    kind = "counter"
+
+    def __init__(self, name, documentation, label_names=()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels[name] for name in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(tuple(labels[name] for name in self.label_names), 0)
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        return [(self.name, _format_labels(self.label_names, key), value) for key, value in items]
+
+class Histogram:
+    """누적 버킷 히스토그램 (라벨 조합별 버킷 개수, 합계, 개수)"""
+    kind = "histogram"
+
+    def __init__(self, name, documentation, label_names=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [버킷별 개수(+Inf 포함), 합계, 개수]
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(labels[name] for name in self.label_names)
+        bucket = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][bucket] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """with 블록 실행 시간을 초 단위로 기록"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def samples(self):
+        with self._lock:
+            items = [(key, list(counts), total, count) for key, (counts, total, count) in self._values.items()]
+        samples = []
+        for key, counts, total, count in items:
+            cumulative = 0
+            for upper, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.label_names, key, ("le", _format_value(upper)))
+                samples.append((f"{self.name}_bucket", labels, cumulative))
+            labels = _format_labels(self.label_names, key)
+            samples.append((f"{self.name}_sum", labels, total))
+            samples.append((f"{self.name}_count", labels, count))
+        return samples
+
+class CallbackGauge:
+    """조회 시점에 콜백으로 값을 읽는 게이지 (캐시 적중률, 저장소 크기 등)"""
+    kind = "gauge"
+
+    def __init__(self, name, documentation, callback):
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+
+    def samples(self):
+        value = self.callback()
+        return [] if value is None else [(self.name, "", value)]
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            # 같은 이름은 한 번만 등록 (모듈 재임포트 시 기존 지표 재사용)
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name, documentation, label_names=()):
+        return self._register(Counter(name, documentation, label_names))
+
+    def histogram(self, name, documentation, label_names=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, documentation, label_names, buckets))
+
+    def gauge(self, name, documentation, callback):
+        with self._lock:
+            metric = self._metrics[name] = CallbackGauge(name, documentation, callback)
+        return metric
+
+    def render(self):
+        """Prometheus 텍스트 포맷 (version 0.0.4)"""
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{labels} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+registry = MetricsRegistry()
+
+STAGE_SECONDS = registry.histogram(
+    "santapick_stage_seconds", "요청/로딩 단계별 처리 시간 (초)", ("operation", "stage")
+)
+GPT_CALLS = registry.counter(
+    "santapick_gpt_calls_total", "GPT 분석 요청 수 (outcome: success | failure | cache_hit)", ("kind", "outcome")
+)
+GPT_TOKENS = registry.counter(
+    "santapick_gpt_tokens_total", "GPT 응답 usage 기준 토큰 사용량", ("kind", "token_type")
+)
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "santapick_http_request_seconds", "엔드포인트별 전체 응답 시간 (초)", ("endpoint",)
+)
+HTTP_REQUESTS = registry.counter(
+    "santapick_http_requests_total", "엔드포인트별 요청 수", ("endpoint", "status")
+)
+GPT_REQUEST_SECONDS = registry.histogram(
+    "santapick_gpt_request_seconds", "GPT API 호출 시간 (초, 캐시 적중 제외)", ("kind",)
+)
+RECOMMENDATION_CACHE = registry.counter(
+    "santapick_recommendation_cache_total", "세션별 추천 결과 캐시 조회 (outcome: hit | miss)", ("outcome",)
+)
+
+def stage_timer(operation, stage):
+    """단계 처리 시간 측정 (with stage_timer("recommendation", "retrieval"): ...)"""
+    return STAGE_SECONDS.time(operation=operation, stage=stage)
+
+def record_gpt_usage(kind, response):
+    """GPT 응답의 usage 필드로 토큰 사용량 누적"""
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return
+    GPT_TOKENS.inc(getattr(usage, "prompt_tokens", 0) or 0, kind=kind, token_type="prompt")
+    GPT_TOKENS.inc(getattr(usage, "completion_tokens", 0) or 0, kind=kind, token_type="completion")